@@ -1,4 +1,63 @@
 import itertools
+from collections import defaultdict
+
+
+def first_repeat_brute(changes):
+    """Reference implementation: walk the cycle, remembering every frequency."""
+    current_frequency = 0
+    seen_frequencies = {0}
+
+    # itertools.cycle repeats the list of changes indefinitely
+    for change in itertools.cycle(changes):
+        current_frequency += change
+        if current_frequency in seen_frequencies:
+            return current_frequency
+        seen_frequencies.add(current_frequency)
+
+
+def first_repeat(changes):
+    """Find the first repeated frequency in O(N log N), or None if none repeats.
+
+    Frequency i of pass k is prefix[i] + k * drift. A later pass revisits
+    prefix[j] from prefix[i] only if both share a residue modulo the drift,
+    so it is enough to compare neighbours within each residue class.
+    """
+    prefix = list(itertools.accumulate(changes[:-1], initial=0))
+    drift = sum(changes)
+    n = len(changes)
+
+    # Duplicates within the first pass repeat at the second occurrence
+    best = None  # (time of the repeat, frequency)
+    first_seen = {}
+    for j, value in enumerate(prefix):
+        if value in first_seen:
+            best = (j, value)
+            break
+        first_seen[value] = j
+
+    if drift == 0:
+        return best[1] if best else (0 if n else None)
+
+    # With negative drift, mirror the values so frequencies always climb
+    sign = 1 if drift > 0 else -1
+    step = abs(drift)
+
+    classes = defaultdict(list)
+    for i, value in enumerate(prefix):
+        classes[(sign * value) % step].append((sign * value, i))
+
+    for members in classes.values():
+        members.sort()
+        for (low, i), (high, j) in zip(members, members[1:]):
+            if low == high:
+                continue
+            # prefix[i] reaches prefix[j] after this many extra passes
+            cycles = (high - low) // step
+            time = cycles * n + i
+            if best is None or time < best[0]:
+                best = (time, sign * high)
+
+    return best[1] if best else None
 
 
 def solve():
@@ -18,16 +77,11 @@ def solve():
         print(f"Part 1 - Resulting frequency: {part1_frequency}")
 
         # Part 2
-        current_frequency = 0
-        seen_frequencies = {0}
-
-        # itertools.cycle repeats the list of changes indefinitely
-        for change in itertools.cycle(changes):
-            current_frequency += change
-            if current_frequency in seen_frequencies:
-                print(f"Part 2 - First frequency reached twice: {current_frequency}")
-                return
-            seen_frequencies.add(current_frequency)
+        result = first_repeat(changes)
+        if result is None:
+            print("Part 2 - No frequency is ever reached twice.")
+        else:
+            print(f"Part 2 - First frequency reached twice: {result}")
 
     except FileNotFoundError:
         print("Error: input.txt not found.")
@@ -1,56 +1,105 @@
-from collections import Counter
+import numpy as np
 
 
-def solve():
-    try:
-        with open("input.txt", "r") as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
+# Rows handled per bincount, which keeps the int64 bins small
+CHUNK_ROWS = 1 << 16
 
-        # Part 1
-        count_twos = 0
-        count_threes = 0
+# Odd multiplier for the polynomial hashes, which wrap modulo 2**64
+HASH_BASE = np.uint64(0x9E3779B97F4A7C15)
+
+
+def id_matrix(lines, width):
+    # Shorter IDs are padded with NUL bytes
+    return np.frombuffer(
+        b"".join(line.encode().ljust(width, b"\0") for line in lines), dtype=np.uint8
+    ).reshape(len(lines), width)
+
+
+def checksum(lines):
+    """Count IDs with a letter exactly twice / thrice using per-line byte
+    histograms, one bincount per chunk of lines."""
+    width = max(len(line) for line in lines)
+    data = id_matrix(lines, width)
+
+    # Bins only span the bytes that occur; bin 0 collects the padding
+    real = data[data != 0]
+    low = int(real.min()) if real.size else 1
+    span = (int(real.max()) - low + 2) if real.size else 1
+
+    count_twos = count_threes = 0
+    for start in range(0, len(lines), CHUNK_ROWS):
+        chunk = data[start:start + CHUNK_ROWS]
+        rows = len(chunk)
+        keys = np.where(chunk == 0, 0, chunk.astype(np.int64) - low + 1)
+        keys += (np.arange(rows, dtype=np.int64) * span)[:, None]
+        counts = np.bincount(keys.ravel(), minlength=rows * span).reshape(rows, span)
+        counts[:, 0] = 0
+        count_twos += int(np.count_nonzero((counts == 2).any(axis=1)))
+        count_threes += int(np.count_nonzero((counts == 3).any(axis=1)))
+    return count_twos * count_threes
 
-        for line in lines:
-            counts = Counter(line)
 
-            has_two = False
-            has_three = False
+def find_near_duplicate(lines):
+    """Return the common letters of the two IDs differing in exactly one
+    position, or None.
 
-            for count in counts.values():
-                if count == 2:
-                    has_two = True
-                elif count == 3:
-                    has_three = True
+    For each position, every ID is hashed with that position masked out,
+    using a rolling prefix hash; equal hashes are candidates that are then
+    compared exactly. Identical IDs are dropped first, as they differ in no
+    position at all.
+    """
+    by_width = {}
+    for line in dict.fromkeys(lines):
+        by_width.setdefault(len(line), []).append(line)
 
-            if has_two:
-                count_twos += 1
-            if has_three:
-                count_threes += 1
+    for width, group in by_width.items():
+        if len(group) < 2:
+            continue
+        data = id_matrix(group, width)
+        powers = np.full(width + 1, HASH_BASE, dtype=np.uint64)
+        powers[0] = 1
+        powers = np.cumprod(powers, dtype=np.uint64)
 
-        checksum = count_twos * count_threes
-        print(f"Part 1 - Checksum: {checksum}")
+        # full = sum of data[:, i] * base**(width - 1 - i)
+        full = np.zeros(len(group), dtype=np.uint64)
+        for i in range(width):
+            full = full * HASH_BASE + data[:, i]
+
+        prefix = np.zeros(len(group), dtype=np.uint64)  # data[:, :k]
+        for k in range(width):
+            below = prefix * HASH_BASE + data[:, k]  # data[:, :k + 1]
+            # Characters after k keep their weight, those before move up one
+            suffix = full - below * powers[width - 1 - k]
+            masked = prefix * powers[width - 1 - k] + suffix
+            prefix = below
+
+            ranked = np.sort(masked)
+            repeated = ranked[1:][ranked[1:] == ranked[:-1]]
+            if not repeated.size:
+                continue
+            # Hashes can collide, so compare the masked IDs themselves
+            seen = {}
+            for i in np.flatnonzero(np.isin(masked, repeated)):
+                line = group[i]
+                common = line[:k] + line[k + 1:]
+                if common in seen:
+                    return common
+                seen[common] = line
+    return None
+
+
+def solve():
+    try:
+        with open("input.txt", "r") as f:
+            lines = [line.strip() for line in f.readlines() if line.strip()]
+
+        # Part 1
+        print(f"Part 1 - Checksum: {checksum(lines)}")
 
         # Part 2
-        for i in range(len(lines)):
-            for j in range(i + 1, len(lines)):
-                id1 = lines[i]
-                id2 = lines[j]
-
-                # Assume lines have same length
-                diff_count = 0
-                diff_index = -1
-
-                for k in range(len(id1)):
-                    if id1[k] != id2[k]:
-                        diff_count += 1
-                        diff_index = k
-                        if diff_count > 1:
-                            break
-
-                if diff_count == 1:
-                    common_chars = id1[:diff_index] + id1[diff_index + 1 :]
-                    print(f"Part 2 - Common letters: {common_chars}")
-                    return
+        common_chars = find_near_duplicate(lines)
+        if common_chars is not None:
+            print(f"Part 2 - Common letters: {common_chars}")
 
     except FileNotFoundError:
         print("Error: input.txt not found.")
@@ -1,83 +1,131 @@
-import re
-from collections import defaultdict
+import heapq
+import itertools
+import tempfile
 
+import numpy as np
 
-def solve():
-    try:
-        with open("input.txt", "r") as f:
-            lines = f.readlines()
+# Log lines look like "[1518-11-01 00:05] falls asleep", so every field
+# sits at a fixed offset and string order is chronological order.
+MINUTE = slice(15, 17)
+MESSAGE = 19
+GUARD_ID = MESSAGE + len("Guard #")
 
-        # Sort lines chronologically
-        lines.sort()
 
-        guards = defaultdict(lambda: defaultdict(int))
-        guards_total_sleep = defaultdict(int)
+def sorted_log(file_path, chunk_lines=1_000_000):
+    """Yield the log lines in chronological order.
 
-        current_guard = None
+    Logs longer than `chunk_lines` are sorted in chunks spilled to
+    temporary files and merged back with an external merge sort.
+    """
+    runs = []
+    try:
+        with open(file_path, "r") as f:
+            while True:
+                raw = list(itertools.islice(f, chunk_lines))
+                chunk = sorted(line.rstrip("\n") + "\n" for line in raw if line.strip())
+                if not runs and len(raw) < chunk_lines:
+                    # Everything fits in memory
+                    yield from chunk
+                    return
+                if not raw:
+                    break
+                run = tempfile.TemporaryFile("w+")
+                runs.append(run)
+                run.writelines(chunk)
+                run.seek(0)
+
+        yield from heapq.merge(*runs)
+    finally:
+        for run in runs:
+            run.close()
+
+
+class SleepLog:
+    """Per-guard 60-bin minute histograms, accumulated as range adds."""
+
+    def __init__(self, flush_every=100_000):
+        self.guard_ids = []
+        self.rows = {}
+        self.diff = np.zeros((0, 61), dtype=np.int64)
+        self.flush_every = flush_every
+        self._pending = ([], [], [])
+
+    def row(self, guard_id):
+        row = self.rows.get(guard_id)
+        if row is None:
+            row = self.rows[guard_id] = len(self.guard_ids)
+            self.guard_ids.append(guard_id)
+        return row
+
+    def add_sleep(self, row, start, end):
+        rows, starts, ends = self._pending
+        rows.append(row)
+        starts.append(start)
+        ends.append(end)
+        if len(rows) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        rows, starts, ends = self._pending
+        if len(self.guard_ids) > len(self.diff):
+            grown = np.zeros((len(self.guard_ids), 61), dtype=np.int64)
+            grown[:len(self.diff)] = self.diff
+            self.diff = grown
+        if rows:
+            # Difference array: +1 where a nap starts, -1 where it ends
+            np.add.at(self.diff, (rows, starts), 1)
+            np.add.at(self.diff, (rows, ends), -1)
+        self._pending = ([], [], [])
+
+    def histograms(self):
+        self.flush()
+        return np.cumsum(self.diff, axis=1)[:, :60]
+
+    def read(self, lines):
+        current_row = None
         sleep_start = None
 
         for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Parse timestamp and message
-            match = re.match(r"\[(\d+)-(\d+)-(\d+) (\d+):(\d+)\] (.*)", line)
-            if not match:
-                continue
-
-            minute = int(match.group(5))
-            message = match.group(6)
+            minute = int(line[MINUTE])
+            kind = line[MESSAGE]
 
-            if "Guard" in message:
+            if kind == "G":
                 # Guard #10 begins shift
-                guard_match = re.search(r"#(\d+)", message)
-                if guard_match:
-                    current_guard = int(guard_match.group(1))
-            elif "falls asleep" in message:
+                current_row = self.row(int(line[GUARD_ID:].split(None, 1)[0]))
+            elif kind == "f":
+                # falls asleep
                 sleep_start = minute
-            elif "wakes up" in message:
-                if current_guard is not None and sleep_start is not None:
-                    # Record sleep minutes
-                    for m in range(sleep_start, minute):
-                        guards[current_guard][m] += 1
-                        guards_total_sleep[current_guard] += 1
+            elif kind == "w":
+                # wakes up
+                if current_row is not None and sleep_start is not None:
+                    self.add_sleep(current_row, sleep_start, minute)
                     sleep_start = None
 
+
+def solve():
+    try:
+        log = SleepLog()
+        log.read(sorted_log("input.txt"))
+        minutes = log.histograms()
+
         # Strategy 1: Find the guard that has the most minutes asleep
-        if not guards_total_sleep:
+        totals = minutes.sum(axis=1)
+        if not len(totals) or not totals.any():
             print("No sleep data found.")
             return
 
-        sleepiest_guard = max(guards_total_sleep, key=guards_total_sleep.get)
-        sleepiest_guard_minutes = guards[sleepiest_guard]
-
-        if sleepiest_guard_minutes:
-            sleepiest_minute = max(
-                sleepiest_guard_minutes, key=sleepiest_guard_minutes.get
-            )
-            print("Strategy 1:")
-            print(f"Sleepiest Guard: {sleepiest_guard}")
-            print(f"Sleepiest Minute: {sleepiest_minute}")
-            print(f"Result: {sleepiest_guard * sleepiest_minute}")
-        else:
-            print("Strategy 1: No sleep data for the sleepiest guard.")
+        sleepiest = int(np.argmax(totals))
+        sleepiest_guard = log.guard_ids[sleepiest]
+        sleepiest_minute = int(np.argmax(minutes[sleepiest]))
+        print("Strategy 1:")
+        print(f"Sleepiest Guard: {sleepiest_guard}")
+        print(f"Sleepiest Minute: {sleepiest_minute}")
+        print(f"Result: {sleepiest_guard * sleepiest_minute}")
 
         # Strategy 2: Of all guards, which guard is most frequently asleep on the same minute?
-        max_frequency = -1
-        target_guard = -1
-        target_minute = -1
-
-        for guard_id, minutes in guards.items():
-            if not minutes:
-                continue
-            most_frequent_minute = max(minutes, key=minutes.get)
-            frequency = minutes[most_frequent_minute]
-
-            if frequency > max_frequency:
-                max_frequency = frequency
-                target_guard = guard_id
-                target_minute = most_frequent_minute
+        row, target_minute = map(int, np.unravel_index(np.argmax(minutes), minutes.shape))
+        target_guard = log.guard_ids[row]
+        max_frequency = int(minutes[row, target_minute])
 
         print("\nStrategy 2:")
         print(f"Guard: {target_guard}")
@@ -1,111 +1,113 @@
 import re
-from collections import defaultdict
+from collections import namedtuple
 import heapq
 
-
-def parse_graph(lines):
-    adj = defaultdict(list)
-    in_degree = defaultdict(int)
-    all_steps = set()
-
-    for line in lines:
-        match = re.match(
-            r"Step (\w) must be finished before step (\w) can begin.", line
-        )
-        if match:
-            u, v = match.groups()
-            adj[u].append(v)
-            in_degree[v] += 1
-            all_steps.add(u)
-            all_steps.add(v)
-    return adj, in_degree, all_steps
-
-
-def solve():
-    try:
-        with open("input.txt", "r") as f:
-            lines = f.readlines()
-
-        # Part 1
-        adj, in_degree, all_steps = parse_graph(lines)
-
-        queue = []
-        for step in all_steps:
-            if in_degree[step] == 0:
-                heapq.heappush(queue, step)
-
+ScheduleStats = namedtuple("ScheduleStats", "makespan busy_time utilisation order")
+
+
+class StepGraph:
+    """Steps interned to integer ids in name order, so heaps of ids pop
+    steps alphabetically."""
+
+    def __init__(self, edges):
+        self.names = sorted({step for edge in edges for step in edge})
+        ids = {name: i for i, name in enumerate(self.names)}
+        self.adj = [[] for _ in self.names]
+        self.in_degree = [0] * len(self.names)
+        for u, v in edges:
+            self.adj[ids[u]].append(ids[v])
+            self.in_degree[ids[v]] += 1
+
+    @classmethod
+    def parse(cls, lines):
+        edges = []
+        for line in lines:
+            match = re.match(
+                r"Step (\w+) must be finished before step (\w+) can begin.", line
+            )
+            if match:
+                edges.append(match.groups())
+        return cls(edges)
+
+    def letter_durations(self, base_duration):
+        # Step A takes base + 1 seconds, B takes base + 2, and so on
+        return [base_duration + ord(name[0]) - ord("A") + 1 for name in self.names]
+
+    def order(self):
+        in_degree = list(self.in_degree)
+        queue = [i for i, d in enumerate(in_degree) if d == 0]
+        heapq.heapify(queue)
         result = []
 
         while queue:
             u = heapq.heappop(queue)
-            result.append(u)
+            result.append(self.names[u])
+            for v in self.adj[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    heapq.heappush(queue, v)
+
+        return result
+
+    def schedule(self, workers=5, base_duration=60, durations=None):
+        """Discrete-event simulation of `workers` working through the steps.
+
+        `durations` gives the time per step id; by default it is derived
+        from the step letter and `base_duration`.
+        """
+        if durations is None:
+            durations = self.letter_durations(base_duration)
+
+        in_degree = list(self.in_degree)
+        ready = [i for i, d in enumerate(in_degree) if d == 0]
+        heapq.heapify(ready)
+        idle = list(range(workers))
+        running = []  # (finish time, worker, step)
+        busy_time = [0] * workers
+        order = []
+        now = 0
+
+        while True:
+            # Assign available steps to idle workers
+            while idle and ready:
+                worker = heapq.heappop(idle)
+                step = heapq.heappop(ready)
+                heapq.heappush(running, (now + durations[step], worker, step))
+                busy_time[worker] += durations[step]
+
+            if not running:
+                break
 
-            if u in adj:
-                for v in adj[u]:
+            # Advance to the next completion and release every step that
+            # finishes at the same moment before assigning more work
+            now = running[0][0]
+            while running and running[0][0] == now:
+                _, worker, step = heapq.heappop(running)
+                heapq.heappush(idle, worker)
+                order.append(self.names[step])
+                for v in self.adj[step]:
                     in_degree[v] -= 1
                     if in_degree[v] == 0:
-                        heapq.heappush(queue, v)
+                        heapq.heappush(ready, v)
 
-        print(f"Order: {''.join(result)}")
-
-        # Part 2
-        adj, in_degree, all_steps = parse_graph(lines)
+        utilisation = sum(busy_time) / (workers * now) if now else 0.0
+        return ScheduleStats(now, busy_time, utilisation, order)
 
-        queue = []
-        for step in all_steps:
-            if in_degree[step] == 0:
-                heapq.heappush(queue, step)
 
-        workers = [{"step": None, "time_left": 0} for _ in range(5)]
-        current_time = 0
-
-        while True:
-            # 1. Process completions
-            # Check if any worker has finished their task
-            for w in workers:
-                if w["step"] is not None and w["time_left"] == 0:
-                    finished_step = w["step"]
-                    w["step"] = None
-
-                    if finished_step in adj:
-                        for v in adj[finished_step]:
-                            in_degree[v] -= 1
-                            if in_degree[v] == 0:
-                                heapq.heappush(queue, v)
-
-            # 2. Assign work
-            # Try to assign available tasks to idle workers
-            for w in workers:
-                if w["step"] is None and queue:
-                    step = heapq.heappop(queue)
-                    duration = 60 + ord(step) - ord("A") + 1
-                    w["step"] = step
-                    w["time_left"] = duration
-
-            # 3. Check active workers
-            active_workers = False
-            for w in workers:
-                if w["step"] is not None:
-                    active_workers = True
-                    break
-
-            if not active_workers:
-                break
+def solve():
+    try:
+        with open("input.txt", "r") as f:
+            lines = f.readlines()
 
-            # 4. Advance time
-            # Find the minimum time to the next event
-            min_jump = float("inf")
-            for w in workers:
-                if w["step"] is not None:
-                    if w["time_left"] < min_jump:
-                        min_jump = w["time_left"]
+        graph = StepGraph.parse(lines)
 
-            current_time += min_jump
-            for w in workers:
-                if w["step"] is not None:
-                    w["time_left"] -= min_jump
+        # Part 1
+        print(f"Order: {''.join(graph.order())}")
 
-        print(f"Total time: {current_time}")
+        # Part 2
+        stats = graph.schedule(workers=5, base_duration=60)
+        print(f"Total time: {stats.makespan}")
+        print(f"Worker utilisation: {stats.utilisation:.1%}")
 
     except FileNotFoundError:
         print("Error: input.txt not found.")
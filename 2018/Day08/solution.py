@@ -1,66 +1,68 @@
-import sys
+def read_numbers(f, chunk_size=1 << 16):
+    """Yield the integers of a whitespace-separated stream, chunk by chunk."""
+    pending = ""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        tokens = (pending + chunk).split()
+        # The last token may continue into the next chunk
+        if chunk[-1].isspace():
+            pending = ""
+        else:
+            pending = tokens.pop() if tokens else ""
+        yield from map(int, tokens)
+    if pending:
+        yield int(pending)
+
+
+def analyse_tree(numbers):
+    """Return (metadata sum, root value) in a single pass over the stream.
+
+    Nodes are never materialised: the stack holds one frame per open node
+    with its remaining child count, metadata count and finished child values.
+    """
+    numbers = iter(numbers)
+    metadata_total = 0
 
-# Increase recursion depth just in case the tree is deep
-sys.setrecursionlimit(10000)
-
-
-def parse_input(data):
-    return list(map(int, data.strip().split()))
-
-
-def parse_node(data, index):
     # Header: quantity of child nodes, quantity of metadata entries
-    num_children = data[index]
-    num_metadata = data[index + 1]
-    index += 2
-
-    children = []
-    for _ in range(num_children):
-        child_node, new_index = parse_node(data, index)
-        children.append(child_node)
-        index = new_index
-
-    metadata = []
-    for _ in range(num_metadata):
-        metadata.append(data[index])
-        index += 1
-
-    return {"children": children, "metadata": metadata}, index
-
-
-def sum_metadata(node):
-    total = sum(node["metadata"])
-    for child in node["children"]:
-        total += sum_metadata(child)
-    return total
-
-
-def get_node_value(node):
-    if not node["children"]:
-        return sum(node["metadata"])
-
-    value = 0
-    for index in node["metadata"]:
-        # Indices are 1-based
-        if 1 <= index <= len(node["children"]):
-            value += get_node_value(node["children"][index - 1])
-    return value
+    stack = [[next(numbers), next(numbers), []]]
+
+    while True:
+        frame = stack[-1]
+        if frame[0]:
+            frame[0] -= 1
+            stack.append([next(numbers), next(numbers), []])
+            continue
+
+        stack.pop()
+        _, num_metadata, child_values = frame
+        metadata = [next(numbers) for _ in range(num_metadata)]
+        metadata_total += sum(metadata)
+
+        if not child_values:
+            value = sum(metadata)
+        else:
+            value = 0
+            for index in metadata:
+                # Indices are 1-based
+                if 1 <= index <= len(child_values):
+                    value += child_values[index - 1]
+
+        if not stack:
+            return metadata_total, value
+        stack[-1][2].append(value)
 
 
 def solve():
     try:
         with open("input.txt", "r") as f:
-            content = f.read()
-
-        data = parse_input(content)
-        root, _ = parse_node(data, 0)
+            result_p1, result_p2 = analyse_tree(read_numbers(f))
 
         # Part 1
-        result_p1 = sum_metadata(root)
         print(f"Metadata sum: {result_p1}")
 
         # Part 2
-        result_p2 = get_node_value(root)
         print(f"Root node value: {result_p2}")
 
     except FileNotFoundError:
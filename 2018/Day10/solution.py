@@ -1,68 +1,88 @@
 import re
 
+import numpy as np
+
+
 def parse_input(file_path):
-    points = []
+    xs, ys, vxs, vys = [], [], [], []
     with open(file_path, 'r') as f:
         for line in f:
             match = re.match(r'position=<\s*(-?\d+),\s*(-?\d+)> velocity=<\s*(-?\d+),\s*(-?\d+)>', line)
             if match:
-                points.append({
-                    'x': int(match.group(1)),
-                    'y': int(match.group(2)),
-                    'vx': int(match.group(3)),
-                    'vy': int(match.group(4))
-                })
-    return points
+                xs.append(int(match.group(1)))
+                ys.append(int(match.group(2)))
+                vxs.append(int(match.group(3)))
+                vys.append(int(match.group(4)))
+    pos = np.array([xs, ys], dtype=np.int64)
+    vel = np.array([vxs, vys], dtype=np.int64)
+    return pos, vel
+
+
+def positions_at(pos, vel, t):
+    return pos + vel * t
+
 
 def get_bounds(points):
-    min_x = min(p['x'] for p in points)
-    max_x = max(p['x'] for p in points)
-    min_y = min(p['y'] for p in points)
-    max_y = max(p['y'] for p in points)
-    return min_x, max_x, min_y, max_y
+    min_x, min_y = points.min(axis=1)
+    max_x, max_y = points.max(axis=1)
+    return int(min_x), int(max_x), int(min_y), int(max_y)
 
-def update_points(points):
-    for p in points:
-        p['x'] += p['vx']
-        p['y'] += p['vy']
 
-def solve():
-    points = parse_input('input.txt')
-    seconds = 0
-    min_area = float('inf')
-    
-    # We expect the message to appear when the points are closest together.
-    # We can track the bounding box area. When it starts increasing, the previous step was the minimum.
-    
+def estimate_convergence(pos, vel):
+    # The variance of the positions is a quadratic in t:
+    #   Var(p + v*t) = Var(p) + 2*t*Cov(p, v) + t^2 * Var(v)
+    # so its minimum is at t = -Cov(p, v) / Var(v), summed over both axes.
+    p = pos - pos.mean(axis=1, keepdims=True)
+    v = vel - vel.mean(axis=1, keepdims=True)
+    denom = float((v * v).sum())
+    if denom == 0:
+        return 0
+    return max(0, int(round(-float((p * v).sum()) / denom)))
+
+
+def bounding_areas(pos, vel, times):
+    # Bounding-box areas for every time in `times` in one broadcast:
+    # shape (axes, points, times).
+    coords = pos[:, :, None] + vel[:, :, None] * times[None, None, :]
+    extent = coords.max(axis=1) - coords.min(axis=1)
+    return extent[0] * extent[1]
+
+
+def find_message_time(pos, vel, window=16):
+    t = estimate_convergence(pos, vel)
+
+    # The variance minimum is close to, but not always exactly at, the
+    # bounding-box minimum. Refine locally, widening the window until the
+    # minimum is strictly inside it.
     while True:
-        min_x, max_x, min_y, max_y = get_bounds(points)
-        width = max_x - min_x
-        height = max_y - min_y
-        area = width * height
-        
-        if area < min_area:
-            min_area = area
-            # Save state in case this is the minimum
-            best_points = [{'x': p['x'], 'y': p['y']} for p in points]
-            best_seconds = seconds
-        else:
-            # Area started increasing, so the previous state was the message
-            print(f"Message appeared at {best_seconds} seconds.")
-            
-            # Print the message
-            min_x, max_x, min_y, max_y = get_bounds(best_points)
-            grid = [[' ' for _ in range(max_x - min_x + 1)] for _ in range(max_y - min_y + 1)]
-            
-            for p in best_points:
-                grid[p['y'] - min_y][p['x'] - min_x] = '#'
-                
-            for row in grid:
-                print("".join(row))
-            
-            break
-            
-        update_points(points)
-        seconds += 1
+        lo = max(0, t - window)
+        times = np.arange(lo, t + window + 1, dtype=np.int64)
+        areas = bounding_areas(pos, vel, times)
+        best = int(np.argmin(areas))
+        t = int(times[best])
+        if (best > 0 or lo == 0) and best < len(times) - 1:
+            return t
+
+
+def solve():
+    pos, vel = parse_input('input.txt')
+
+    # We expect the message to appear when the points are closest together,
+    # i.e. when the bounding box area is at its minimum.
+    best_seconds = find_message_time(pos, vel)
+    best_points = positions_at(pos, vel, best_seconds)
+    print(f"Message appeared at {best_seconds} seconds.")
+
+    # Print the message
+    min_x, max_x, min_y, max_y = get_bounds(best_points)
+    grid = [[' ' for _ in range(max_x - min_x + 1)] for _ in range(max_y - min_y + 1)]
+
+    for x, y in best_points.T:
+        grid[y - min_y][x - min_x] = '#'
+
+    for row in grid:
+        print("".join(row))
+
 
 if __name__ == "__main__":
     solve()
@@ -1,130 +1,138 @@
+import time
+
+# Directions: 0:^, 1:>, 2:v, 3:<
+CART_DIRECTIONS = {"^": 0, ">": 1, "v": 2, "<": 3}
+CART_TRACKS = {"^": "|", "v": "|", ">": "-", "<": "-"}
+
+# Turn tables: new direction indexed by current direction.
+TURNS = {
+    "|": (0, 1, 2, 3),
+    "-": (0, 1, 2, 3),
+    "/": (1, 0, 3, 2),
+    "\\": (3, 2, 1, 0),
+}
+
+# Intersections cycle Left, Straight, Right: indexed by [turn_state][direction].
+INTERSECTION_TURNS = (
+    (3, 0, 1, 2),
+    (0, 1, 2, 3),
+    (1, 2, 3, 0),
+)
+
+
 class Cart:
-    def __init__(self, x, y, direction):
-        self.x = x
-        self.y = y
+    __slots__ = ("pos", "direction", "turn_state", "crashed")
+
+    def __init__(self, pos, direction):
+        self.pos = pos  # y * width + x
         self.direction = direction  # 0:^, 1:>, 2:v, 3:<
         self.turn_state = 0  # 0:Left, 1:Straight, 2:Right
         self.crashed = False
 
     def __repr__(self):
-        return f"Cart({self.x}, {self.y}, {self.direction})"
+        return f"Cart({self.pos}, {self.direction})"
 
 
-def solve():
-    with open("input.txt", "r") as f:
-        lines = [line.strip("\n") for line in f]
-
-    grid = []
+def parse_tracks(lines):
+    """Return (track, width, carts) with the grid flattened to one string."""
+    width = max(len(line) for line in lines) + 1
+    rows = []
     carts = []
 
-    # Directions: 0:^, 1:>, 2:v, 3:<
-    dx = [0, 1, 0, -1]
-    dy = [-1, 0, 1, 0]
-
     for y, line in enumerate(lines):
-        row = []
+        row = list(line.ljust(width))
         for x, char in enumerate(line):
-            if char in "^>v<":
-                direction = {"^": 0, ">": 1, "v": 2, "<": 3}[char]
-                carts.append(Cart(x, y, direction))
+            if char in CART_DIRECTIONS:
+                carts.append(Cart(y * width + x, CART_DIRECTIONS[char]))
                 # Replace cart with track
-                if char in "^v":
-                    row.append("|")
-                else:
-                    row.append("-")
-            else:
-                row.append(char)
-        grid.append(row)
+                row[x] = CART_TRACKS[char]
+        rows.append("".join(row))
+
+    return "".join(rows), width, carts
+
+
+def simulate(track, width, carts):
+    """Run until at most one cart is left.
 
+    Returns (first_crash, last_cart, ticks) where positions are flat indices.
+    """
+    deltas = (-width, 1, width, -1)
+    occupied = {cart.pos: cart for cart in carts}
+    first_crash = None
     tick = 0
-    first_crash_reported = False
 
-    while True:
+    while len(occupied) > 1:
         tick += 1
-        # Sort carts by y, then x
-        carts.sort(key=lambda c: (c.y, c.x))
 
-        for i, cart in enumerate(carts):
+        # Carts move in reading order, which is ascending flat position.
+        for _, cart in sorted(occupied.items()):
             if cart.crashed:
                 continue
 
-            # Move cart
-            cart.x += dx[cart.direction]
-            cart.y += dy[cart.direction]
+            pos = cart.pos
+            del occupied[pos]
+            pos += deltas[cart.direction]
+            # Rows carry a blank column, so only the top and bottom can be left
+            if not 0 <= pos < len(track):
+                d = cart.direction
+                x = cart.pos % width + (d == 1) - (d == 3)
+                y = cart.pos // width + (d == 2) - (d == 0)
+                raise ValueError(f"Cart out of bounds at {x},{y}")
+            cart.pos = pos
 
             # Check for collision
-            for other in carts:
-                if (
-                    other != cart
-                    and not other.crashed
-                    and other.x == cart.x
-                    and other.y == cart.y
-                ):
-                    cart.crashed = True
-                    other.crashed = True
-                    if not first_crash_reported:
-                        print(f"Part 1 - First crash: {cart.x},{cart.y}")
-                        first_crash_reported = True
-                    break
-
-            if cart.crashed:
+            other = occupied.pop(pos, None)
+            if other is not None:
+                cart.crashed = True
+                other.crashed = True
+                if first_crash is None:
+                    first_crash = pos
                 continue
 
+            occupied[pos] = cart
+
             # Update direction based on track
-            try:
-                track = grid[cart.y][cart.x]
-            except IndexError:
-                print(f"Error: Cart out of bounds at {cart.x},{cart.y}")
-                return
-
-            if track == "+":
-                if cart.turn_state == 0:  # Left
-                    cart.direction = (cart.direction - 1) % 4
-                elif cart.turn_state == 1:  # Straight
-                    pass
-                elif cart.turn_state == 2:  # Right
-                    cart.direction = (cart.direction + 1) % 4
+            piece = track[pos]
+            if piece == "+":
+                cart.direction = INTERSECTION_TURNS[cart.turn_state][cart.direction]
                 cart.turn_state = (cart.turn_state + 1) % 3
+            else:
+                turns = TURNS.get(piece)
+                if turns is None:
+                    raise ValueError(
+                        f"Cart went off track at {pos % width},{pos // width} (track: '{piece}')"
+                    )
+                cart.direction = turns[cart.direction]
 
-            elif track == "/":
-                if cart.direction == 0:
-                    cart.direction = 1
-                elif cart.direction == 1:
-                    cart.direction = 0
-                elif cart.direction == 2:
-                    cart.direction = 3
-                elif cart.direction == 3:
-                    cart.direction = 2
-
-            elif track == "\\":
-                if cart.direction == 0:
-                    cart.direction = 3
-                elif cart.direction == 1:
-                    cart.direction = 2
-                elif cart.direction == 2:
-                    cart.direction = 1
-                elif cart.direction == 3:
-                    cart.direction = 0
-
-            elif track in "|-":
-                pass
+    last_cart = next(iter(occupied.values()), None)
+    return first_crash, last_cart, tick
 
-            else:
-                print(
-                    f"Error: Cart went off track at {cart.x},{cart.y} (track: '{track}')"
-                )
-                return
-
-        # Remove crashed carts
-        carts = [c for c in carts if not c.crashed]
-
-        if len(carts) == 1:
-            last_cart = carts[0]
-            print(f"Part 2 - Last cart position: {last_cart.x},{last_cart.y}")
-            return
-        elif len(carts) == 0:
-            print("All carts crashed!")
-            return
+
+def solve():
+    with open("input.txt", "r") as f:
+        lines = [line.strip("\n") for line in f]
+
+    track, width, carts = parse_tracks(lines)
+
+    start = time.perf_counter()
+    try:
+        first_crash, last_cart, ticks = simulate(track, width, carts)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    elapsed = time.perf_counter() - start
+
+    if first_crash is not None:
+        print(f"Part 1 - First crash: {first_crash % width},{first_crash // width}")
+
+    if last_cart is None:
+        print("All carts crashed!")
+    else:
+        x, y = last_cart.pos % width, last_cart.pos // width
+        print(f"Part 2 - Last cart position: {x},{y}")
+
+    rate = ticks / elapsed if elapsed else float("inf")
+    print(f"{len(carts)} carts, {ticks} ticks in {elapsed:.3f}s ({rate:,.0f} ticks/s)")
 
 
 if __name__ == "__main__":
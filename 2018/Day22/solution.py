@@ -1,100 +1,187 @@
-import sys
 import heapq
 
-# Set recursion limit higher just in case
-sys.setrecursionlimit(20000)
+import numpy as np
+
+MODULO = 20183
+
+# Tools: 0=Neither, 1=Torch, 2=Climbing Gear
+# Regions: 0=Rocky, 1=Wet, 2=Narrow
+# Valid tools for region type T: {0, 1, 2} - {T}
+TORCH = 1
+SWITCH_COST = 7
+
+# States are packed as ((y << COORD_BITS) | x) << 2 | tool
+COORD_BITS = 24
+COORD_MASK = (1 << COORD_BITS) - 1
+
+# Blocks narrower than this are filled by a scalar row scan instead of
+# vectorised anti-diagonals
+DIAGONAL_MIN = 128
+
+
+class Cave:
+    """Erosion levels and region types, grown in blocks on demand."""
+
+    def __init__(self, depth, target_x, target_y):
+        self.depth = depth
+        self.target = (target_x, target_y)
+        self.erosion = np.zeros((0, 0), dtype=np.int64)
+        self.region = np.zeros((0, 0), dtype=np.int8)
+        self.ensure(target_x + 1, target_y + 1)
+
+    def ensure(self, width, height):
+        """Grow the tables so they cover at least width x height."""
+        old_h, old_w = self.erosion.shape
+        if width <= old_w and height <= old_h:
+            return
+
+        new_w = max(width, old_w * 2) if width > old_w else old_w
+        new_h = max(height, old_h * 2) if height > old_h else old_h
+        erosion = np.zeros((new_h, new_w), dtype=np.int64)
+        erosion[:old_h, :old_w] = self.erosion
+        self.erosion = erosion
+
+        # New columns to the right of the old table, then all new rows
+        self._fill_block(old_w, new_w, 0, old_h)
+        self._fill_block(0, new_w, old_h, new_h)
+        self.region = (self.erosion % 3).astype(np.int8)
+        # Plain bytes rows keep per-cell lookups in the search cheap
+        self.region_rows = [row.tobytes() for row in self.region]
+
+    def _geo_index(self, x, y, left, up):
+        if (x, y) == self.target:
+            return 0
+        if y == 0:
+            return x * 16807
+        if x == 0:
+            return y * 48271
+        return left * up
+
+    def _fill_block(self, x0, x1, y0, y1):
+        bw, bh = x1 - x0, y1 - y0
+        if bw <= 0 or bh <= 0:
+            return
+        if min(bw, bh) < DIAGONAL_MIN:
+            self._fill_rows(x0, x1, y0, y1)
+        else:
+            self._fill_diagonals(x0, x1, y0, y1)
+
+    def _fill_rows(self, x0, x1, y0, y1):
+        # Row by row: each cell needs its left neighbour from the same row,
+        # so narrow blocks are cheapest as a scalar scan.
+        erosion = self.erosion
+        depth = self.depth
+        up = erosion[y0 - 1, x0:x1].tolist() if y0 > 0 else [0] * (x1 - x0)
+        for y in range(y0, y1):
+            left = int(erosion[y, x0 - 1]) if x0 > 0 else 0
+            row = []
+            for x, above in zip(range(x0, x1), up):
+                left = (self._geo_index(x, y, left, above) + depth) % MODULO
+                row.append(left)
+            erosion[y, x0:x1] = row
+            up = row
+
+    def _fill_diagonals(self, x0, x1, y0, y1):
+        # Each cell depends on its left and upper neighbours, so the cells
+        # of one anti-diagonal are independent and can be computed together.
+        bw, bh = x1 - x0, y1 - y0
+        erosion = self.erosion
+        tx, ty = self.target
+        for d in range(bw + bh - 1):
+            i = np.arange(max(0, d - bw + 1), min(d, bh - 1) + 1)
+            ys = y0 + i
+            xs = x0 + d - i
+
+            geo = erosion[ys - 1, xs] * erosion[ys, xs - 1]
+            if y0 == 0:
+                geo = np.where(ys == 0, xs * 16807, geo)
+            if x0 == 0:
+                geo = np.where(xs == 0, ys * 48271, geo)
+                geo[(xs == 0) & (ys == 0)] = 0
+            if x0 + y0 + d == tx + ty:
+                geo[(xs == tx) & (ys == ty)] = 0
+
+            erosion[ys, xs] = (geo + self.depth) % MODULO
+
+    def risk_level(self):
+        tx, ty = self.target
+        return int(self.region[:ty + 1, :tx + 1].sum())
+
+    def rescue_time(self):
+        """A* over packed (x, y, tool) states.
+
+        Returns (time, nodes_expanded).
+        """
+        tx, ty = self.target
+
+        def heuristic(x, y, tool):
+            h = abs(x - tx) + abs(y - ty)
+            return h if tool == TORCH else h + SWITCH_COST
+
+        start = TORCH
+        goal = ((ty << COORD_BITS) | tx) << 2 | TORCH
+        best_time = {start: 0}
+        queue = [(heuristic(0, 0, TORCH), 0, start)]
+        expanded = 0
+        height, width = self.erosion.shape
+
+        while queue:
+            _, time, state = heapq.heappop(queue)
+
+            if time > best_time[state]:
+                continue
+            if state == goal:
+                return time, expanded
+            expanded += 1
+
+            tool = state & 3
+            x = (state >> 2) & COORD_MASK
+            y = state >> (COORD_BITS + 2)
+
+            if x + 1 >= width or y + 1 >= height:
+                self.ensure(x + 2, y + 2)
+                height, width = self.erosion.shape
+            rows = self.region_rows
+
+            # 1. Switch Tool: the only other tool valid in this region
+            next_tool = 3 - tool - rows[y][x]
+            next_state = state - tool + next_tool
+            new_time = time + SWITCH_COST
+            if new_time < best_time.get(next_state, new_time + 1):
+                best_time[next_state] = new_time
+                heapq.heappush(queue, (new_time + heuristic(x, y, next_tool), new_time, next_state))
+
+            # 2. Move
+            new_time = time + 1
+            for nx, ny in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if nx < 0 or ny < 0 or rows[ny][nx] == tool:
+                    continue
+                next_state = ((ny << COORD_BITS) | nx) << 2 | tool
+                if new_time < best_time.get(next_state, new_time + 1):
+                    best_time[next_state] = new_time
+                    heapq.heappush(queue, (new_time + heuristic(nx, ny, tool), new_time, next_state))
+
+        return None, expanded
+
+
+def parse_input(file_path):
+    with open(file_path, "r") as f:
+        depth = int(f.readline().split(":")[1])
+        target_x, target_y = map(int, f.readline().split(":")[1].split(","))
+    return depth, target_x, target_y
 
 
 def solve():
-    depth = 11394
-    target_x, target_y = 7, 701
-
-    # Memoization for erosion levels
-    erosion_cache = {}
-
-    def get_erosion_level(x, y):
-        if (x, y) in erosion_cache:
-            return erosion_cache[(x, y)]
-
-        geo_index = 0
-        if (x, y) == (0, 0):
-            geo_index = 0
-        elif (x, y) == (target_x, target_y):
-            geo_index = 0
-        elif y == 0:
-            geo_index = x * 16807
-        elif x == 0:
-            geo_index = y * 48271
-        else:
-            geo_index = get_erosion_level(x - 1, y) * get_erosion_level(x, y - 1)
-
-        erosion_level = (geo_index + depth) % 20183
-        erosion_cache[(x, y)] = erosion_level
-        return erosion_level
+    depth, target_x, target_y = parse_input("input.txt")
+    cave = Cave(depth, target_x, target_y)
 
     # Part 1
-    total_risk = 0
-    for y in range(target_y + 1):
-        for x in range(target_x + 1):
-            el = get_erosion_level(x, y)
-            risk = el % 3
-            total_risk += risk
-
-    print(f"Part 1 Result: {total_risk}")
+    print(f"Part 1 Result: {cave.risk_level()}")
 
     # Part 2
-    # Tools: 0=Neither, 1=Torch, 2=Climbing Gear
-    # Regions: 0=Rocky, 1=Wet, 2=Narrow
-    # Valid tools for region type T: {0, 1, 2} - {T}
     # Target is Rocky (0), so valid tools are {1, 2}. Start with Torch (1). End with Torch (1).
-
-    # Dijkstra
-    # State: (time, x, y, tool)
-    queue = [(0, 0, 0, 1)]
-    best_time = {}  # (x, y, tool) -> time
-    best_time[(0, 0, 1)] = 0
-
-    while queue:
-        time, x, y, tool = heapq.heappop(queue)
-
-        # Pruning: if we found a faster way to this state already
-        if time > best_time.get((x, y, tool), float("inf")):
-            continue
-
-        if (x, y) == (target_x, target_y) and tool == 1:
-            print(f"Part 2 Result: {time}")
-            break
-
-        # Current region type
-        current_type = get_erosion_level(x, y) % 3
-
-        # 1. Switch Tool
-        for next_tool in range(3):
-            if next_tool != tool and next_tool != current_type:
-                # Can switch to next_tool
-                new_time = time + 7
-                if new_time < best_time.get((x, y, next_tool), float("inf")):
-                    best_time[(x, y, next_tool)] = new_time
-                    heapq.heappush(queue, (new_time, x, y, next_tool))
-
-        # 2. Move
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if nx < 0 or ny < 0:
-                continue
-
-            # Heuristic pruning to avoid exploring too far
-            # Increased buffer to 100
-            if nx > target_x + 100 or ny > target_y + 100:
-                continue
-
-            # Check if valid tool for new region
-            next_type = get_erosion_level(nx, ny) % 3
-            if tool != next_type:
-                new_time = time + 1
-                if new_time < best_time.get((nx, ny, tool), float("inf")):
-                    best_time[(nx, ny, tool)] = new_time
-                    heapq.heappush(queue, (new_time, nx, ny, tool))
+    time, expanded = cave.rescue_time()
+    print(f"Part 2 Result: {time} ({expanded} nodes expanded)")
 
 
 if __name__ == "__main__":
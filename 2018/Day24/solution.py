@@ -1,31 +1,56 @@
+import os
 import re
-import copy
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+IMMUNE = "Immune System"
+INFECTION = "Infection"
+
 
 class Group:
+    __slots__ = (
+        "id", "index", "army_type", "units", "hp", "weaknesses", "immunities",
+        "attack_damage", "attack_type", "initiative", "boost", "multipliers",
+    )
+
     def __init__(self, id, army_type, units, hp, weaknesses, immunities, attack_damage, attack_type, initiative):
         self.id = id
+        self.index = 0  # position among all groups, set by parse_input
         self.army_type = army_type
         self.units = units
         self.hp = hp
-        self.weaknesses = weaknesses
-        self.immunities = immunities
+        self.weaknesses = frozenset(weaknesses)
+        self.immunities = frozenset(immunities)
         self.attack_damage = attack_damage
         self.attack_type = attack_type
         self.initiative = initiative
         self.boost = 0
-        
+        # Damage multiplier against each group, indexed by Group.index
+        self.multipliers = ()
+
+    def clone(self, boost=0):
+        # Only the mutable fields differ between battles; everything else
+        # is shared with the original.
+        group = Group.__new__(Group)
+        for name in Group.__slots__:
+            setattr(group, name, getattr(self, name))
+        group.boost = boost
+        return group
+
     @property
     def effective_power(self):
         return self.units * (self.attack_damage + self.boost)
-        
-    def calculate_damage(self, target):
+
+    def multiplier(self, target):
         if self.attack_type in target.immunities:
             return 0
-        damage = self.effective_power
         if self.attack_type in target.weaknesses:
-            damage *= 2
-        return damage
-        
+            return 2
+        return 1
+
+    def calculate_damage(self, target):
+        return self.effective_power * self.multipliers[target.index]
+
     def __repr__(self):
         return f"{self.army_type} {self.id}: {self.units} units, {self.hp} HP, {self.effective_power} EP"
 
@@ -42,11 +67,11 @@ def parse_input(filename):
         if not line:
             continue
         if line == "Immune System:":
-            current_army = "Immune System"
+            current_army = IMMUNE
             group_id_counter = 1
             continue
         if line == "Infection:":
-            current_army = "Infection"
+            current_army = INFECTION
             group_id_counter = 1
             continue
             
@@ -79,38 +104,52 @@ def parse_input(filename):
             
             groups.append(Group(group_id_counter, current_army, units, hp, weaknesses, immunities, attack_damage, attack_type, initiative))
             group_id_counter += 1
-            
+
+    # Damage multipliers never change, so work them out once
+    for index, group in enumerate(groups):
+        group.index = index
+    for group in groups:
+        group.multipliers = tuple(group.multiplier(target) for target in groups)
+
     return groups
 
-def fight(groups):
+def fight(groups, attack_order):
     # Target Selection Phase
     groups.sort(key=lambda g: (-g.effective_power, -g.initiative))
-    
+
     targets = {} # attacker -> target
     targeted = set()
-    
+
     for attacker in groups:
-        possible_targets = [g for g in groups if g.army_type != attacker.army_type and g not in targeted]
-        if not possible_targets:
-            continue
-            
-        # Select target that takes most damage, then largest EP, then highest initiative
-        possible_targets.sort(key=lambda t: (-attacker.calculate_damage(t), -t.effective_power, -t.initiative))
-        
-        best_target = possible_targets[0]
-        if attacker.calculate_damage(best_target) > 0:
+        multipliers = attacker.multipliers
+        best_target = None
+        best_key = None
+
+        # Select target that takes most damage, then largest EP, then highest initiative.
+        # The attacker's power is the same for every target, so comparing
+        # multipliers is enough for the damage part.
+        for target in groups:
+            if target.army_type == attacker.army_type or target in targeted:
+                continue
+            multiplier = multipliers[target.index]
+            if multiplier == 0:
+                continue
+            key = (multiplier, target.effective_power, target.initiative)
+            if best_key is None or key > best_key:
+                best_key = key
+                best_target = target
+
+        if best_target is not None:
             targets[attacker] = best_target
             targeted.add(best_target)
-            
+
     # Attacking Phase
-    groups.sort(key=lambda g: -g.initiative)
-    
     total_units_killed = 0
-    
-    for attacker in groups:
+
+    for attacker in attack_order:
         if attacker.units <= 0:
             continue
-            
+
         target = targets.get(attacker)
         if target and target.units > 0:
             damage = attacker.calculate_damage(target)
@@ -118,58 +157,111 @@ def fight(groups):
             units_killed = min(units_killed, target.units)
             target.units -= units_killed
             total_units_killed += units_killed
-            
+
     # Remove dead groups
     return [g for g in groups if g.units > 0], total_units_killed
 
-def solve():
-    initial_groups = parse_input("input.txt")
-    
-    # Part 1
-    groups = copy.deepcopy(initial_groups)
+def battle(initial_groups, boost=0):
+    """Fight to the end. Returns (immune_units, infection_units)."""
+    groups = [g.clone(boost if g.army_type == IMMUNE else 0) for g in initial_groups]
+    # Initiative never changes, so the attack order only needs sorting once
+    attack_order = sorted(groups, key=lambda g: -g.initiative)
+
     while True:
-        immune_count = sum(1 for g in groups if g.army_type == "Immune System")
-        infection_count = sum(1 for g in groups if g.army_type == "Infection")
-        
-        if immune_count == 0 or infection_count == 0:
+        immune_count = sum(1 for g in groups if g.army_type == IMMUNE)
+        if immune_count == 0 or immune_count == len(groups):
             break
-            
-        groups, killed = fight(groups)
+
+        groups, killed = fight(groups, attack_order)
         if killed == 0: # Stalemate detection
             break
-            
-    remaining_units = sum(g.units for g in groups)
-    print(f"Part 1 Result: {remaining_units}")
-    
+        attack_order = [g for g in attack_order if g.units > 0]
+
+    immune_alive = sum(g.units for g in groups if g.army_type == IMMUNE)
+    infection_alive = sum(g.units for g in groups if g.army_type == INFECTION)
+    return immune_alive, infection_alive
+
+_worker_groups = None
+
+def _init_worker(groups):
+    global _worker_groups
+    _worker_groups = groups
+
+def _battle_worker(boost):
+    return battle(_worker_groups, boost)
+
+class BoostSearch:
+    """Find the smallest boost that lets the immune system win.
+
+    Outcomes are not monotonic in the boost (some boosts end in a
+    stalemate), so after an exponential and a k-ary search narrow down the
+    first win, a window below it is scanned linearly. Each step evaluates
+    a batch of boosts in parallel.
+    """
+
+    def __init__(self, groups, workers=None, window=32):
+        self.groups = groups
+        self.workers = workers or os.cpu_count() or 1
+        self.window = window
+        self.battles = 0
+        self.results = {}
+
+    def run(self, boosts, pool):
+        boosts = [b for b in boosts if b not in self.results]
+        for boost, outcome in zip(boosts, pool.map(_battle_worker, boosts)):
+            self.results[boost] = outcome
+        self.battles += len(boosts)
+
+    def wins(self, boost):
+        immune_alive, infection_alive = self.results[boost]
+        return infection_alive == 0 and immune_alive > 0
+
+    def search(self):
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.groups,)) as pool:
+            # Exponential search for a winning boost
+            lo, hi = 0, None
+            bound = 1
+            while hi is None:
+                batch = [bound << k for k in range(self.workers)]
+                self.run(batch, pool)
+                for boost in batch:
+                    if self.wins(boost):
+                        hi = boost
+                        break
+                    lo = boost
+                bound = batch[-1] << 1
+
+            # k-ary search: lo loses, hi wins
+            while hi - lo > 1:
+                span = hi - lo
+                batch = sorted({lo + span * (k + 1) // (self.workers + 1) for k in range(self.workers)} - {lo, hi})
+                self.run(batch, pool)
+                for boost in batch:
+                    if self.wins(boost):
+                        hi = boost
+                        break
+                    lo = boost
+
+            # Local linear scan below the first win found
+            self.run(range(max(1, hi - self.window), hi), pool)
+
+        best = min(b for b in self.results if self.wins(b))
+        return best, self.results[best][0]
+
+def solve():
+    initial_groups = parse_input("input.txt")
+
+    # Part 1
+    immune_alive, infection_alive = battle(initial_groups)
+    print(f"Part 1 Result: {immune_alive + infection_alive}")
+
     # Part 2
-    # Binary search or linear search for boost?
-    # Linear search is safer for small values, but let's see.
-    boost = 1
-    while True:
-        groups = copy.deepcopy(initial_groups)
-        for g in groups:
-            if g.army_type == "Immune System":
-                g.boost = boost
-                
-        while True:
-            immune_count = sum(1 for g in groups if g.army_type == "Immune System")
-            infection_count = sum(1 for g in groups if g.army_type == "Infection")
-            
-            if immune_count == 0 or infection_count == 0:
-                break
-                
-            groups, killed = fight(groups)
-            if killed == 0: # Stalemate
-                break
-        
-        immune_alive = sum(g.units for g in groups if g.army_type == "Immune System")
-        infection_alive = sum(g.units for g in groups if g.army_type == "Infection")
-        
-        if infection_alive == 0 and immune_alive > 0:
-            print(f"Part 2 Result: {immune_alive}")
-            break
-        
-        boost += 1
+    start = time.perf_counter()
+    search = BoostSearch(initial_groups)
+    boost, immune_alive = search.search()
+    elapsed = time.perf_counter() - start
+    print(f"Part 2 Result: {immune_alive}")
+    print(f"Boost {boost}: {search.battles} battles simulated in {elapsed:.3f}s")
 
 if __name__ == "__main__":
     solve()
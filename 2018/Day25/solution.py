@@ -1,25 +1,46 @@
+import itertools
+import sys
+import time
+from collections import defaultdict
+
+# Points within this Manhattan distance join the same constellation
+LINK_DIST = 3
+
+# Above this many points the O(N^2) cross-check only runs with --brute
+BRUTE_LIMIT = 5000
+
+# Neighbouring grid cells: every offset in {-1, 0, 1}^4 (81 cells). Only
+# the lexicographically non-negative half is needed so that each pair of
+# cells is visited once; the zero offset is handled separately.
+NEIGHBOUR_OFFSETS = [
+    d for d in itertools.product((-1, 0, 1), repeat=4) if d > (0, 0, 0, 0)
+]
+
+
 # Union-Find (Disjoint Set Union) structure
 class DSU:
     def __init__(self, n):
         self.parent = list(range(n))
-        self.rank = [0] * n
+        self.size = [1] * n
         self.num_sets = n
 
     def find(self, i):
-        if self.parent[i] != i:
-            self.parent[i] = self.find(self.parent[i])
-        return self.parent[i]
+        parent = self.parent
+        while parent[i] != i:
+            # Path halving
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
 
     def union(self, i, j):
         root_i = self.find(i)
         root_j = self.find(j)
 
         if root_i != root_j:
-            if self.rank[root_i] < self.rank[root_j]:
+            if self.size[root_i] < self.size[root_j]:
                 root_i, root_j = root_j, root_i
             self.parent[root_j] = root_i
-            if self.rank[root_i] == self.rank[root_j]:
-                self.rank[root_i] += 1
+            self.size[root_i] += self.size[root_j]
             self.num_sets -= 1
             return True
         return False
@@ -29,6 +50,53 @@ def manhattan_dist(p1, p2):
     return sum(abs(a - b) for a, b in zip(p1, p2))
 
 
+def count_constellations_brute(points):
+    """Reference O(N^2) clustering."""
+    n = len(points)
+    dsu = DSU(n)
+    for i in range(n):
+        for j in range(i + 1, n):
+            if manhattan_dist(points[i], points[j]) <= LINK_DIST:
+                dsu.union(i, j)
+    return dsu.num_sets
+
+
+def count_constellations(points):
+    """Cluster points by comparing each only with its neighbouring grid cells.
+
+    With cells of side LINK_DIST, two linked points differ by at most one
+    cell along every axis.
+    """
+    cells = defaultdict(list)
+    for i, (a, b, c, d) in enumerate(points):
+        cells[(a // LINK_DIST, b // LINK_DIST, c // LINK_DIST, d // LINK_DIST)].append(i)
+
+    dsu = DSU(len(points))
+
+    for (ca, cb, cc, cd), members in cells.items():
+        # Pairs within the same cell
+        for k, i in enumerate(members):
+            a, b, c, d = points[i]
+            for j in members[k + 1:]:
+                e, f, g, h = points[j]
+                if abs(a - e) + abs(b - f) + abs(c - g) + abs(d - h) <= LINK_DIST:
+                    dsu.union(i, j)
+
+        # Pairs with neighbouring cells
+        for da, db, dc, dd in NEIGHBOUR_OFFSETS:
+            others = cells.get((ca + da, cb + db, cc + dc, cd + dd))
+            if not others:
+                continue
+            for i in members:
+                a, b, c, d = points[i]
+                for j in others:
+                    e, f, g, h = points[j]
+                    if abs(a - e) + abs(b - f) + abs(c - g) + abs(d - h) <= LINK_DIST:
+                        dsu.union(i, j)
+
+    return dsu.num_sets
+
+
 def solve():
     points = []
     with open("input.txt", "r") as f:
@@ -36,18 +104,22 @@ def solve():
             if line.strip():
                 points.append(tuple(map(int, line.strip().split(","))))
 
-    n = len(points)
-    dsu = DSU(n)
-
-    # Brute force O(N^2) comparison since N is small (lines are ~1300 but N points probably similar or less)
-    # 1300 points is fine for O(N^2) ~ 1.6M operations.
+    start = time.perf_counter()
+    result = count_constellations(points)
+    elapsed = time.perf_counter() - start
+    print(f"Part 1 Result: {result}")
 
-    for i in range(n):
-        for j in range(i + 1, n):
-            if manhattan_dist(points[i], points[j]) <= 3:
-                dsu.union(i, j)
+    if len(points) > BRUTE_LIMIT and "--brute" not in sys.argv:
+        print(f"Grid hash: {elapsed:.3f}s, brute force skipped ({len(points)} points)")
+        return
 
-    print(f"Part 1 Result: {dsu.num_sets}")
+    start = time.perf_counter()
+    reference = count_constellations_brute(points)
+    brute_elapsed = time.perf_counter() - start
+    print(
+        f"Grid hash: {elapsed:.3f}s, brute force: {brute_elapsed:.3f}s"
+        f" ({'match' if reference == result else 'MISMATCH'})"
+    )
 
 
 if __name__ == "__main__":
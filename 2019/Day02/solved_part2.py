@@ -1,28 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+
 with open('input.txt', 'r') as file:
-  data = list(map(int, file.read().splitlines()[0].split(",")))
+  data = list(map(int, file.read().strip().split(",")))
 
-def solve(input):
+TARGET = 19690720
+
+# Symbolic values are polynomials in noun and verb, stored as
+# {(noun power, verb power): coefficient}. None marks a value read from an
+# address that depends on noun or verb; it is fine as long as it never
+# reaches an opcode, an address or program[0].
+NOUN = {(1, 0): 1}
+VERB = {(0, 1): 1}
+
+class NotConcrete(Exception):
+  pass
+
+def constant(value):
+  return {(0, 0): value} if value else {}
+
+def add(a, b):
+  if a is None or b is None:
+    return None
+  result = dict(a)
+  for term, coefficient in b.items():
+    result[term] = result.get(term, 0) + coefficient
+    if result[term] == 0:
+      del result[term]
+  return result
+
+def mul(a, b):
+  if a is None or b is None:
+    return None
+  result = {}
+  for (n1, v1), c1 in a.items():
+    for (n2, v2), c2 in b.items():
+      term = (n1 + n2, v1 + v2)
+      result[term] = result.get(term, 0) + c1 * c2
+      if result[term] == 0:
+        del result[term]
+  return result
+
+def concrete(value):
+  # Opcodes and addresses must not depend on noun or verb
+  if value is None or any(term != (0, 0) for term in value):
+    raise NotConcrete()
+  return value.get((0, 0), 0)
+
+def load(program, address):
+  try:
+    return program[concrete(address)]
+  except NotConcrete:
+    return None
+
+def runSymbolic(input):
+  program = [constant(value) for value in input]
+  program[1] = NOUN
+  program[2] = VERB
+
+  i = 0
+
+  while True:
+    opcode = concrete(program[i])
+    if opcode in (1, 2):
+      a = load(program, program[i + 1])
+      b = load(program, program[i + 2])
+      out = concrete(program[i + 3])
+      program[out] = add(a, b) if opcode == 1 else mul(a, b)
+      i += 4
+    elif opcode == 99:
+      return program[0]
+    else:
+      raise NotConcrete()
+
+def solveAffine(result):
+  # program[0] = c + a * noun + b * verb
+  if any(n + v > 1 for n, v in result):
+    return None
+  c = result.get((0, 0), 0)
+  a = result.get((1, 0), 0)
+  b = result.get((0, 1), 0)
 
   for noun in range(0, 100):
-    for verb in range(0, 100):
-      program = input.copy()
-
-      program[1] = noun
-      program[2] = verb
-
-      i = 0
-
-      while True:
-        if program[i] == 1:
-          program[program[i+3]] = program[program[i+2]] + program[program[i+1]]
-          i += 4
-        elif program[i] == 2:
-          program[program[i+3]] = program[program[i+2]] * program[program[i+1]]
-          i += 4
-        elif program[i] == 99:
-          break
-      
-      if program[0] == 19690720:
+    rest = TARGET - c - a * noun
+    if b == 0:
+      if rest == 0:
+        return 100 * noun
+      continue
+    verb, remainder = divmod(rest, b)
+    if remainder == 0 and 0 <= verb < 100:
+      return 100 * noun + verb
+
+def run(program):
+  i = 0
+
+  while True:
+    if program[i] == 1:
+      program[program[i+3]] = program[program[i+2]] + program[program[i+1]]
+      i += 4
+    elif program[i] == 2:
+      program[program[i+3]] = program[program[i+2]] * program[program[i+1]]
+      i += 4
+    elif program[i] == 99:
+      return program[0]
+    else:
+      return None
+
+def searchNoun(args):
+  # One worker tries every verb for a noun, resetting a single memory
+  # image in place rather than copying the program each time.
+  image, noun = args
+  program = list(image)
+  for verb in range(0, 100):
+    program[:] = image
+    program[1] = noun
+    program[2] = verb
+    try:
+      if run(program) == TARGET:
         return 100 * noun + verb
+    except IndexError:
+      pass
+
+def searchParallel(input):
+  with ProcessPoolExecutor() as pool:
+    for result in pool.map(searchNoun, ((input, noun) for noun in range(0, 100))):
+      if result is not None:
+        return result
+
+def solve(input):
+  try:
+    result = runSymbolic(input)
+  except NotConcrete:
+    result = None
+
+  if result is not None:
+    answer = solveAffine(result)
+    if answer is not None or all(n + v <= 1 for n, v in result):
+      return answer
+
+  return searchParallel(input)
 
-print(solve(data))
\ No newline at end of file
+if __name__ == "__main__":
+  print(solve(data))
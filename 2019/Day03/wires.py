@@ -0,0 +1,86 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+
+# A wire is stored as segments instead of unit steps. Each segment is
+# (fixed, lo, hi, start, steps): it runs along one axis between lo and hi
+# at the given fixed coordinate of the other axis, starting at `start`
+# after `steps` steps. Horizontal and vertical segments are kept apart.
+def lineToSegments(line):
+  horizontal = []
+  vertical = []
+  steps = 0
+  x = 0
+  y = 0
+  for instruction in line.split(","):
+    direction = instruction[0]
+    length = int(instruction[1:])
+    if direction == "U":
+      vertical.append((x, y - length, y, y, steps))
+      y -= length
+    if direction == "D":
+      vertical.append((x, y, y + length, y, steps))
+      y += length
+    if direction == "R":
+      horizontal.append((y, x, x + length, x, steps))
+      x += length
+    if direction == "L":
+      horizontal.append((y, x - length, x, x, steps))
+      x -= length
+    steps += length
+  return horizontal, vertical
+
+def stepsTo(segment, along):
+  fixed, lo, hi, start, steps = segment
+  return steps + abs(along - start)
+
+# Perpendicular crossings via a sweep over x: horizontal segments are
+# active between their ends and kept in a sorted index by y, each vertical
+# segment queries the index for the y range it covers.
+def perpendicularCrossings(horizontal, vertical):
+  events = []
+  for i, (y, lo, hi, _, _) in enumerate(horizontal):
+    events.append((lo, 0, i))
+    events.append((hi, 2, i))
+  for j, (x, _, _, _, _) in enumerate(vertical):
+    events.append((x, 1, j))
+  events.sort()
+
+  active = []  # sorted (y, i)
+  for x, kind, index in events:
+    if kind == 0:
+      insort(active, (horizontal[index][0], index))
+    elif kind == 2:
+      active.pop(bisect_left(active, (horizontal[index][0], index)))
+    else:
+      v = vertical[index]
+      first = bisect_left(active, (v[1], -1))
+      last = bisect_right(active, (v[2], len(horizontal)))
+      for y, i in active[first:last]:
+        yield x, y, stepsTo(horizontal[i], x) + stepsTo(v, y)
+
+# Overlapping collinear segments: with both step counts linear along the
+# overlap, the best points are its ends and the point closest to 0, plus
+# their neighbours in case one of them is the origin.
+def collinearCrossings(segments1, segments2, swap):
+  byFixed = defaultdict(list)
+  for s in segments2:
+    byFixed[s[0]].append(s)
+  for s1 in segments1:
+    for s2 in byFixed.get(s1[0], ()):
+      lo = max(s1[1], s2[1])
+      hi = min(s1[2], s2[2])
+      if lo > hi:
+        continue
+      for along in {lo, lo + 1, hi - 1, hi, -1, 0, 1}:
+        if not lo <= along <= hi:
+          continue
+        point = (s1[0], along) if swap else (along, s1[0])
+        yield point[0], point[1], stepsTo(s1, along) + stepsTo(s2, along)
+
+def crossings(wire1, wire2):
+  h1, v1 = wire1
+  h2, v2 = wire2
+  yield from perpendicularCrossings(h1, v2)
+  yield from perpendicularCrossings(h2, v1)
+  yield from collinearCrossings(h1, h2, False)
+  yield from collinearCrossings(v1, v2, True)
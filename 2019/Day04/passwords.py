@@ -0,0 +1,51 @@
+from functools import lru_cache
+
+# Valid passwords never decrease, so they are determined by their run
+# lengths. Count them with a digit DP instead of testing every integer.
+# goodRun(length) says whether a run of equal digits satisfies the pair
+# rule; runs longer than 3 are passed as 3.
+
+@lru_cache(maxsize=None)
+def completions(remaining, digit, run, ok, goodRun):
+  # Non-decreasing suffixes of `remaining` digits after a run of `run`
+  # copies of `digit`; `ok` says whether an earlier run already qualifies.
+  if remaining == 0:
+    return 1 if ok or goodRun(run) else 0
+  total = completions(remaining - 1, digit, min(run + 1, 3), ok, goodRun)
+  closed = ok or goodRun(run)
+  for nextDigit in range(digit + 1, 10):
+    total += completions(remaining - 1, nextDigit, 1, closed, goodRun)
+  return total
+
+def countBelow(bound, goodRun):
+  # Valid passwords in [1, bound)
+  digits = list(map(int, str(bound)))
+  n = 0
+
+  # Shorter numbers: any first digit
+  for length in range(1, len(digits)):
+    for first in range(1, 10):
+      n += completions(length - 1, first, 1, False, goodRun)
+
+  # Same length: walk the bound's prefix, branching below each digit
+  prev, run, ok = 1, 0, False
+  for i, b in enumerate(digits):
+    for d in range(prev, b):
+      if i > 0 and d == prev:
+        n += completions(len(digits) - i - 1, d, min(run + 1, 3), ok, goodRun)
+      else:
+        n += completions(len(digits) - i - 1, d, 1, ok or goodRun(run), goodRun)
+    if b < prev:
+      break
+    if i > 0 and b == prev:
+      run = min(run + 1, 3)
+    else:
+      ok = ok or goodRun(run)
+      run = 1
+    prev = b
+
+  return n
+
+def countBetween(lower, upper, goodRun):
+  # Valid passwords in [lower, upper)
+  return countBelow(upper, goodRun) - countBelow(lower, goodRun)
@@ -1,19 +1,13 @@
-from collections import Counter
+from passwords import countBetween
 
 with open('input.txt', 'r') as file:
   data = file.read().splitlines()
 
+def goodRun(length):
+  return length == 2
+
 def solve(input):
   lower, upper = map(int, input[0].split("-"))
-  n = 0
-
-  for x in range(lower, upper):
-    candidate = str(x)
-    counts = Counter(candidate)
-    twosame = 2 in counts.values()
-    increases = list(candidate) == sorted(candidate)
-    if twosame and increases: n += 1
-
-  return n
+  return countBetween(lower, upper, goodRun)
 
-print(solve(data))
\ No newline at end of file
+print(solve(data))
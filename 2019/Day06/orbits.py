@@ -0,0 +1,95 @@
+import numpy as np
+
+class OrbitIndex:
+  """The orbit map as a parent array over interned integer ids.
+
+  up[k][v] is the object 2^k orbits above v, with every root orbiting
+  itself. The table is built by pointer jumping, which also sums the
+  depths, so both take O(N log D) vectorised work for a tree of depth D.
+  """
+
+  def __init__(self, entries):
+    ids = {}
+    names = []
+    parents = []
+
+    def intern(name):
+      i = ids.get(name)
+      if i is None:
+        i = ids[name] = len(names)
+        names.append(name)
+        parents.append(i)
+      return i
+
+    for centre, satellite in entries:
+      a = intern(centre)
+      b = intern(satellite)
+      if parents[b] != b:
+        raise ValueError(f"{satellite} orbits more than one object")
+      parents[b] = a
+
+    self.ids = ids
+    self.names = names
+    n = len(names)
+    dtype = np.int32 if n < 2 ** 31 else np.int64
+
+    parent = np.array(parents, dtype=dtype)
+    depth = (parent != np.arange(n, dtype=dtype)).astype(np.int64)
+    self.up = [parent]
+    while True:
+      anc = self.up[-1]
+      jump = anc[anc]
+      if np.array_equal(jump, anc):
+        break
+      # A tree needs at most log2(N) doublings; more means a cycle
+      if len(self.up) > n.bit_length():
+        raise ValueError("orbit map contains a cycle")
+      depth += depth[anc]
+      self.up.append(jump)
+    # Jumping around a cycle can also settle, but not on a true root
+    roots = self.up[-1]
+    if not np.array_equal(parent[roots], roots):
+      raise ValueError("orbit map contains a cycle")
+    self.depth = depth
+
+  @classmethod
+  def fromLines(cls, lines):
+    return cls(line.strip().split(")") for line in lines if line.strip())
+
+  def totalOrbits(self):
+    # Every object orbits each of its ancestors, directly or indirectly
+    return int(self.depth.sum())
+
+  def lowestCommonAncestors(self, us, vs):
+    """Batch LCA by binary lifting; -1 where the objects share no root."""
+    us = np.asarray(us, dtype=self.up[0].dtype)
+    vs = np.asarray(vs, dtype=self.up[0].dtype)
+    swap = self.depth[us] < self.depth[vs]
+    us, vs = np.where(swap, vs, us), np.where(swap, us, vs)
+
+    # Lift the deeper object to the depth of the other
+    diff = self.depth[us] - self.depth[vs]
+    for k, anc in enumerate(self.up):
+      us = np.where((diff >> k) & 1 == 1, anc[us], us)
+
+    # Then lift both while they stay apart
+    for anc in reversed(self.up):
+      au, av = anc[us], anc[vs]
+      apart = au != av
+      us = np.where(apart, au, us)
+      vs = np.where(apart, av, vs)
+
+    lca = np.where(us == vs, us, self.up[0][us])
+    return np.where(self.up[-1][us] == self.up[-1][vs], lca, -1)
+
+  def distances(self, us, vs):
+    """Edges between each pair of objects; -1 where they are unconnected."""
+    lca = self.lowestCommonAncestors(us, vs)
+    dist = self.depth[us] + self.depth[vs] - 2 * self.depth[np.maximum(lca, 0)]
+    return np.where(lca >= 0, dist, -1)
+
+  def transfers(self, a, b):
+    # Transfers move between the objects a and b orbit, not a and b themselves
+    pa = self.up[0][self.ids[a]]
+    pb = self.up[0][self.ids[b]]
+    return int(self.distances([pa], [pb])[0])
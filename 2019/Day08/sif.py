@@ -0,0 +1,59 @@
+import numpy as np
+
+BLACK, WHITE, TRANSPARENT = 0, 1, 2
+ZERO = ord('0')
+
+# Bytes of image data decoded per batch of layers
+BATCH_BYTES = 1 << 24
+
+def loadLayers(path, width = 25, height = 6):
+  """The image as a read-only (layers, height, width) array of digit bytes.
+
+  The file is memory-mapped, so only the batches being decoded are read.
+  """
+  data = np.memmap(path, dtype=np.uint8, mode='r')
+  end = len(data)
+  while end and not ZERO <= data[end - 1] <= ZERO + 9:
+    end -= 1
+  if end % (width * height):
+    raise ValueError(f"{end} digits do not split into {width}x{height} layers")
+  return data[:end].reshape(-1, height, width)
+
+def layerBatches(layers):
+  step = max(1, BATCH_BYTES // layers[0].size) if len(layers) else 1
+  for start in range(0, len(layers), step):
+    yield start, np.asarray(layers[start:start + step]) - ZERO
+
+def colourCounts(batch):
+  # One bincount for the whole batch, offsetting each layer by ten colours
+  flat = batch.reshape(len(batch), -1)
+  offsets = 10 * np.arange(len(batch))[:, None]
+  return np.bincount((flat + offsets).ravel(), minlength=10 * len(batch)).reshape(-1, 10)
+
+def checksum(layers):
+  """Ones times twos on the layer with the fewest zeros."""
+  best = None
+  for _, batch in layerBatches(layers):
+    counts = colourCounts(batch)
+    i = int(np.argmin(counts[:, BLACK]))
+    if best is None or counts[i, BLACK] < best[BLACK]:
+      best = counts[i]
+  return int(best[WHITE] * best[TRANSPARENT])
+
+def composite(layers):
+  """The first non-transparent pixel at each position, front layer first."""
+  image = np.full(layers.shape[1:], TRANSPARENT, dtype=np.uint8)
+  for _, batch in layerBatches(layers):
+    opaque = batch != TRANSPARENT
+    first = opaque.argmax(axis=0)
+    pixels = np.take_along_axis(batch, first[None], axis=0)[0]
+    fill = (image == TRANSPARENT) & opaque.any(axis=0)
+    image[fill] = pixels[fill]
+    # Later layers are hidden once every pixel is set
+    if not (image == TRANSPARENT).any():
+      break
+  return image
+
+def render(image):
+  palette = {BLACK: '░', WHITE: '█', TRANSPARENT: ' '}
+  return "\n".join("".join(palette[int(p)] for p in row) for row in image)
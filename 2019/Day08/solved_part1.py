@@ -1,20 +1,6 @@
-from collections import defaultdict
+from sif import checksum, loadLayers
 
-with open('input.txt', 'r') as file:
-  data = list(map(int, file.read().splitlines()[0]))
+def solve(path, width = 25, height = 6):
+  return checksum(loadLayers(path, width, height))
 
-def solve(data):
-  width, height = 25, 6
-  i = 0
-  checksums = {}
-
-  while i < len(data):
-    colors = defaultdict(lambda: 0)
-    for _ in range(width * height):
-      colors[data[i]] += 1
-      i += 1
-    checksums[colors[0]] = colors[1] * colors[2]
-
-  return checksums[min(checksums.keys())]
-
-print(solve(data))
\ No newline at end of file
+print(solve('input.txt'))
@@ -1,53 +1,96 @@
-import math
+from fractions import Fraction
+import numpy as np
+
+# Pairs handled per vectorised block when scoring stations
+CHUNK = 1 << 22
 
 with open('input.txt', 'r') as file:
   data = list(file.read().splitlines())
 
-def solve(input):
-  points = dict()
-  x, y = -1, -1
-
-  for line in input:
-    y += 1
-    x = -1
-    for char in line:
-      x += 1
+def parseAsteroids(input):
+  xs, ys = [], []
+  for y, line in enumerate(input):
+    for x, char in enumerate(line):
       if char == "#":
-        points[(x,y)] = dict()
-  
-  for p in points.keys():
-    for other in points.keys():
-      if p == other: continue
-      rad = math.atan2(other[1]-p[1], other[0]-p[0])
-      if rad < (math.pi / 2 * -1): rad = math.pi + math.pi + rad
-      key = int(rad * 1000000)
-      if key not in points[p]:
-        points[p][key] = list()
-      points[p][key].append(other)
-    
-  station = max(points, key = lambda p: len(points[p].values()))
-
-  for p in points.keys():
-    for key in points[p].keys():
-      points[p][key].sort(key = lambda p2: abs(p[0] - p2[0]) + abs(p[1] - p2[1]))
-
-  print('station at', station)
-  for x in sorted(points[station].keys()): print(x, ' => ', points[station][x])
-
-  i = 0
-  printed = True
-  while i < 200 and printed:
-    printed = False
-    for key in sorted(points[station].keys()):
-      if len(points[station][key]) == 0: continue
-      i += 1
-      target = points[station][key].pop(0)
-      result = target[0] * 100 + target[1]
-      print(i, 'zapping', target, 'result would be', result)
-      printed = True
-      if i == 200: break
-
-  return 'done for station', station
+        xs.append(x)
+        ys.append(y)
+  return np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64)
+
+def directions(xs, ys, sx, sy):
+  # Offsets from the station(s), reduced by their gcd so that every
+  # asteroid on the same line of sight shares one integer direction.
+  # The gcd itself is the distance rank along that line.
+  dx = xs - sx
+  dy = ys - sy
+  g = np.gcd(dx, dy)
+  safe = np.where(g == 0, 1, g)
+  return dx // safe, dy // safe, g
+
+def visibleCounts(xs, ys):
+  n = len(xs)
+  width = int(xs.max() - xs.min()) if n else 0
+  height = int(ys.max() - ys.min()) if n else 0
+  span = 2 * height + 1
+  counts = np.zeros(n, dtype=np.int64)
+  rows = max(1, CHUNK // max(n, 1))
+
+  for start in range(0, n, rows):
+    stop = min(n, start + rows)
+    rx, ry, g = directions(xs[None, :], ys[None, :], xs[start:stop, None], ys[start:stop, None])
+    keys = (rx + width) * span + (ry + height)
+    # The station itself gets a sentinel below every real direction
+    keys[g == 0] = -1
+    keys.sort(axis=1)
+    counts[start:stop] = np.count_nonzero(np.diff(keys, axis=1), axis=1)
+
+  return counts
+
+def clockwiseKey(u, v):
+  # Exact angle key, clockwise from straight up (y grows downwards).
+  # Each quadrant is rotated onto the first so the slope a / b grows
+  # with the angle, and compared as a Fraction to avoid float ties.
+  if u >= 0 and v < 0: return (0, Fraction(u, -v))
+  if u > 0 and v >= 0: return (1, Fraction(v, u))
+  if u <= 0 and v > 0: return (2, Fraction(-u, v))
+  return (3, Fraction(-v, -u))
+
+def vaporisationOrder(xs, ys, station):
+  others = np.arange(len(xs)) != station
+  ox, oy = xs[others], ys[others]
+  rx, ry, g = directions(ox, oy, xs[station], ys[station])
+
+  # Sort the distinct directions once, then give every asteroid the
+  # position of its direction in the sweep
+  unique, inverse = np.unique(np.stack([rx, ry], axis=1), axis=0, return_inverse=True)
+  inverse = inverse.reshape(-1)
+  sweep = sorted(range(len(unique)), key = lambda i: clockwiseKey(int(unique[i, 0]), int(unique[i, 1])))
+  angle = np.empty(len(unique), dtype=np.int64)
+  angle[sweep] = np.arange(len(unique))
+  angle = angle[inverse]
+
+  # Rank along each line of sight: 0 for the nearest, 1 behind it, ...
+  byLine = np.lexsort((g, angle))
+  firstOfLine = np.r_[True, angle[byLine][1:] != angle[byLine][:-1]]
+  starts = np.maximum.accumulate(np.where(firstOfLine, np.arange(len(byLine)), 0))
+  rank = np.empty(len(byLine), dtype=np.int64)
+  rank[byLine] = np.arange(len(byLine)) - starts
+
+  # Each rotation of the laser removes one rank
+  order = np.lexsort((angle, rank))
+  return ox[order], oy[order]
+
+def solve(input, nth = 200):
+  xs, ys = parseAsteroids(input)
+  counts = visibleCounts(xs, ys)
+  station = int(np.argmax(counts))
+  print('station at', (int(xs[station]), int(ys[station])), 'sees', int(counts[station]))
+
+  tx, ty = vaporisationOrder(xs, ys, station)
+  if len(tx) < nth:
+    return None
+  target = (int(tx[nth - 1]), int(ty[nth - 1]))
+  print(nth, 'zapping', target)
+  return target[0] * 100 + target[1]
 
 # Not 315
-print(solve(data))
\ No newline at end of file
+print(solve(data))
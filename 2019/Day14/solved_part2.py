@@ -1,88 +1,108 @@
-from math import ceil, floor
-from collections import defaultdict
+TRILLION = 1000000000000
 
-with open("input.txt", "r") as file:
-    data = file.read().splitlines()
+
+def parseReactions(lines):
     reactions = dict()
-    for line in data:
+    for line in lines:
+        if not line.strip():
+            continue
         parts = line.split(" => ")
         inputs = []
         for i in parts[0].split(","):
             spl = i.split()
             inputs.append((int(spl[0]), spl[1].strip()))
         outparts = parts[1].strip().split()
-        output = (int(outparts[0]), outparts[1])
-        reactions[output] = inputs
-
-
-def solveFor(reactions, fuelNeeded):
-    needed = {"FUEL": fuelNeeded}
-    leftovers = defaultdict(int)
-
-    while True:
-        if len(needed) == 1 and "ORE" in needed:
-            break
-
-        newneeded = dict()
-
-        if "ORE" in needed:
-            newneeded["ORE"] = needed["ORE"]
-
-        for n in needed:
-            for rkey in reactions:
-                if rkey[1] == n:
-                    actuallyneeded = max(0, needed[n] - leftovers[n])
-                    leftovers[n] -= needed[n] - actuallyneeded
-                    if actuallyneeded == 0:
-                        continue
-
-                    produced = rkey[0]
-                    factor = int(ceil(actuallyneeded / produced))
-                    ingredients = reactions[rkey]
-                    surplus = (produced * factor) - actuallyneeded
-                    leftovers[n] += surplus
-
-                    for ing in ingredients:
-                        alreadyneeded = (
-                            0 if ing[1] not in newneeded else newneeded[ing[1]]
-                        )
-                        req = ing[0] * factor
-                        newneeded[ing[1]] = req + alreadyneeded
-
-        needed = newneeded
-
-    return needed
-
-
-def solve(reactions):
-    trillion = 1000000000000
-
-    # Binary search approach
-    # First, get the ORE cost for 1 FUEL
-    ore_per_fuel = solveFor(reactions, 1)["ORE"]
-
-    # Initial estimate for bounds
-    low = trillion // ore_per_fuel  # Lower bound estimate
-    high = low * 2  # Upper bound estimate
-
-    # Find a valid upper bound
-    while solveFor(reactions, high)["ORE"] <= trillion:
-        high *= 2
-
-    # Binary search for the maximum fuel
-    result = low
-    while low <= high:
-        mid = (low + high) // 2
-        ore_needed = solveFor(reactions, mid)["ORE"]
-
-        if ore_needed <= trillion:
-            result = mid  # This amount works, try for more
-            low = mid + 1
-        else:
-            high = mid - 1  # Too much ore needed, try less
-
-    return result
-
-
-# Could well be a lucky answer though, off-by-one for other inputs..
-print("Part 2:", solve(reactions))
+        reactions[outparts[1]] = (int(outparts[0]), inputs)
+    return reactions
+
+
+class Nanofactory:
+    """Reactions compiled into integer ids in topological order.
+
+    order lists every chemical after all chemicals that consume it, so a
+    single pass from FUEL towards ORE settles each requirement before it
+    is expanded into ingredients.
+    """
+
+    def __init__(self, reactions):
+        names = ["FUEL"]
+        ids = {"FUEL": 0}
+
+        def intern(name):
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+            return ids[name]
+
+        for output in reactions:
+            intern(output)
+        for _, inputs in reactions.values():
+            for _, name in inputs:
+                intern(name)
+
+        self.names = names
+        self.fuel = ids["FUEL"]
+        self.ore = intern("ORE")
+        self.produced = [0] * len(names)
+        self.inputs = [()] * len(names)
+        for output, (amount, inputs) in reactions.items():
+            chem = ids[output]
+            self.produced[chem] = amount
+            self.inputs[chem] = tuple((qty, ids[name]) for qty, name in inputs)
+
+        # Kahn's algorithm over "is consumed by" edges
+        consumers = [0] * len(names)
+        for inputs in self.inputs:
+            for _, chem in inputs:
+                consumers[chem] += 1
+        ready = [chem for chem in range(len(names)) if consumers[chem] == 0]
+        self.order = []
+        while ready:
+            chem = ready.pop()
+            self.order.append(chem)
+            for _, ing in self.inputs[chem]:
+                consumers[ing] -= 1
+                if consumers[ing] == 0:
+                    ready.append(ing)
+        if len(self.order) != len(names):
+            raise ValueError("reactions contain a cycle")
+
+    def oreFor(self, fuelNeeded):
+        needed = [0] * len(self.names)
+        needed[self.fuel] = fuelNeeded
+        produced = self.produced
+        for chem in self.order:
+            amount = needed[chem]
+            if amount <= 0 or not self.inputs[chem]:
+                continue
+            batches = -(-amount // produced[chem])
+            for qty, ing in self.inputs[chem]:
+                needed[ing] += qty * batches
+        return needed[self.ore]
+
+    def maxFuel(self, ore=TRILLION):
+        orePerFuel = self.oreFor(1)
+        if orePerFuel > ore:
+            return 0
+
+        # Leftovers only ever help, so ore // orePerFuel always fits
+        low = ore // orePerFuel
+        high = low * 2
+        while self.oreFor(high) <= ore:
+            low, high = high, high * 2
+
+        # Invariant: low fits, high does not
+        while high - low > 1:
+            mid = (low + high) // 2
+            if self.oreFor(mid) <= ore:
+                low = mid
+            else:
+                high = mid
+        return low
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as file:
+        factory = Nanofactory(parseReactions(file.read().splitlines()))
+
+    print("Part 2:", factory.maxFuel())
@@ -1,66 +1,35 @@
-from math import ceil
-from collections import defaultdict
+from solved_part2 import Nanofactory, TRILLION, parseReactions
+
+EXAMPLE = """\
+157 ORE => 5 NZVS
+165 ORE => 6 DCFZ
+44 XJWVT, 5 KHKGT, 1 QDVJ, 29 NZVS, 9 GPVTF, 48 HKGWZ => 1 FUEL
+12 HKGWZ, 1 GPVTF, 8 PSHF => 9 QDVJ
+179 ORE => 7 PSHF
+177 ORE => 5 HKGWZ
+7 DCFZ, 7 PSHF => 2 XJWVT
+165 ORE => 2 GPVTF
+3 DCFZ, 7 NZVS, 5 HKGWZ, 10 PSHF => 8 KHKGT"""
+
+# The puzzle example: 13312 ORE per FUEL, 82892753 FUEL per trillion
+example = Nanofactory(parseReactions(EXAMPLE.splitlines()))
+assert example.oreFor(1) == 13312
+assert example.maxFuel() == 82892753
 
 with open("input.txt", "r") as file:
-    data = file.read().splitlines()
-    reactions = dict()
-    for line in data:
-        parts = line.split(" => ")
-        inputs = []
-        for i in parts[0].split(","):
-            spl = i.split()
-            inputs.append((int(spl[0]), spl[1].strip()))
-        outparts = parts[1].strip().split()
-        output = (int(outparts[0]), outparts[1])
-        reactions[output] = inputs
+    factory = Nanofactory(parseReactions(file.read().splitlines()))
 
-
-def solveFor(reactions, fuelNeeded):
-    needed = {"FUEL": fuelNeeded}
-    leftovers = defaultdict(int)
-
-    while True:
-        if len(needed) == 1 and "ORE" in needed:
-            break
-
-        newneeded = dict()
-
-        if "ORE" in needed:
-            newneeded["ORE"] = needed["ORE"]
-
-        for n in needed:
-            for rkey in reactions:
-                if rkey[1] == n:
-                    actuallyneeded = max(0, needed[n] - leftovers[n])
-                    leftovers[n] -= needed[n] - actuallyneeded
-                    if actuallyneeded == 0:
-                        continue
-
-                    produced = rkey[0]
-                    factor = int(ceil(actuallyneeded / produced))
-                    ingredients = reactions[rkey]
-                    surplus = (produced * factor) - actuallyneeded
-                    leftovers[n] += surplus
-
-                    for ing in ingredients:
-                        alreadyneeded = (
-                            0 if ing[1] not in newneeded else newneeded[ing[1]]
-                        )
-                        req = ing[0] * factor
-                        newneeded[ing[1]] = req + alreadyneeded
-
-        needed = newneeded
-
-    return needed["ORE"]
-
-
-trillion = 1000000000000
+assert factory.oreFor(1) == 628586
 
 # Test the answer and one more
 test_values = [3209254, 3209255]
 
 for fuel in test_values:
-    ore_needed = solveFor(reactions, fuel)
-    fits = "FITS" if ore_needed <= trillion else "TOO MUCH"
+    ore_needed = factory.oreFor(fuel)
+    fits = "FITS" if ore_needed <= TRILLION else "TOO MUCH"
     print(f"FUEL: {fuel:,} -> ORE: {ore_needed:,} {fits}")
-    print(f"  Difference from trillion: {ore_needed - trillion:,}")
+    print(f"  Difference from trillion: {ore_needed - TRILLION:,}")
+
+assert factory.oreFor(test_values[0]) <= TRILLION < factory.oreFor(test_values[1])
+assert factory.maxFuel() == test_values[0]
+print("OK")
@@ -1,30 +1,22 @@
-from collections import defaultdict
+import numpy as np
 
 def firsteight(freqs):
   return ''.join(list(map(str, freqs))[:8])
 
+def patternMatrix(maxlength):
+  # Row i repeats every element of [0, 1, 0, -1] i + 1 times, skipping the first
+  pattern = np.array([0, 1, 0, -1], dtype=np.int64)
+  rows = np.arange(1, maxlength + 1)[:, None]
+  cols = np.arange(1, maxlength + 1)[None, :]
+  return pattern[(cols // rows) % 4]
+
 def solve(input):
-  freqs = data.copy()
-  pattern = [0, 1, 0, -1]
-  maxlength = len(freqs)
+  freqs = np.array(input, dtype=np.int64)
+  matrix = patternMatrix(len(freqs))
 
   for _ in range(100):
-    newfreqs = []
-
-    for i in range(maxlength):
-      newf = 0
-      j = 0
-      for j in range(maxlength):
-        repeats = i + 1
-        pidx = (j + 1) // repeats
-        pidx = pidx % 4
-        factor = pattern[pidx]
-        newf += freqs[j] * factor
-        
-      newfreqs.append(abs(newf) % 10)
-    
-    freqs = newfreqs
-  
+    freqs = np.abs(matrix @ freqs) % 10
+
   return firsteight(freqs)
 
 
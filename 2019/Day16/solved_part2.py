@@ -1,69 +1,117 @@
+from math import isqrt
 from time import time
 
+import numpy as np
 
-def solve_part2(data):
+PHASES = 100
+REPEATS = 10000
+
+
+def suffix_phase(signal):
     """
-    Optimized solution for Part 2.
+    One phase for a signal that starts in the second half.
+
+    From the middle on the pattern is 0 before the position and 1 after it,
+    so each new digit is the sum of all digits from that position to the
+    end, mod 10: a reversed cumulative sum.
+    """
+    sums = np.cumsum(signal[::-1], dtype=np.int32)[::-1]
+    return (sums % 10).astype(np.int8)
 
-    Key insight: When the message offset is in the second half of the signal,
-    the FFT pattern simplifies dramatically. For positions in the second half,
-    the pattern only contains 1s (no 0s or -1s), which means each new digit
-    is just the sum of all digits from that position to the end, mod 10.
 
-    This allows us to compute from right to left using cumulative sums.
+def pattern_phase(signal, offset=0):
     """
-    # Get the message offset from first 7 digits
-    message_offset = int(data[:7])
+    One phase of the full 0, 1, 0, -1 pattern for the digits of a signal
+    starting at `offset`.
 
-    # Repeat the input 10000 times
-    full_signal = list(map(int, data)) * 10000
-    total_length = len(full_signal)
+    Output k (1-based) adds the blocks [k-1 + 4mk, 2k-1 + 4mk) and
+    subtracts [3k-1 + 4mk, 4k-1 + 4mk), each read from a prefix sum. There
+    are about n / 2k blocks per output, O(n log n) in total. Digits before
+    `offset` never contribute to outputs at or after it.
 
-    print(f"Message offset: {message_offset}")
-    print(f"Total signal length: {total_length}")
-    print(f"Offset is in second half: {message_offset > total_length // 2}")
+    Small k loop over their blocks; large k, which only have a few blocks
+    each, instead loop over the block number m and handle every k at once.
+    """
+    length = len(signal)
+    n = offset + length
+    prefix = np.zeros(length + 1, dtype=np.int64)
+    np.cumsum(signal, out=prefix[1:])
+
+    def blocks(starts, widths):
+        # Sum of signal[start:start + width], in global positions
+        lo = np.minimum(starts - offset, length)
+        hi = np.minimum(starts + widths - offset, length)
+        return prefix[hi] - prefix[lo]
+
+    totals = np.zeros(length, dtype=np.int64)
+    cutoff = max(isqrt(n), offset)
+
+    for k in range(offset + 1, cutoff + 1):
+        starts = np.arange(k - 1, n, 4 * k, dtype=np.int64)
+        totals[k - 1 - offset] = blocks(starts, k).sum() - blocks(starts + 2 * k, k).sum()
+
+    ks = np.arange(cutoff + 1, n + 1, dtype=np.int64)
+    m = 0
+    while True:
+        # Block m exists for k - 1 + 4mk < n; ks is sorted, so it is a prefix
+        count = np.searchsorted(ks, n // (4 * m + 1), side="right")
+        if count == 0:
+            break
+        k = ks[:count]
+        starts = k - 1 + 4 * m * k
+        totals[cutoff - offset:cutoff - offset + count] += blocks(starts, k) - blocks(starts + 2 * k, k)
+        m += 1
+
+    return (np.abs(totals) % 10).astype(np.int8)
+
+
+def run_phases(signal, step, phases=PHASES):
+    timings = []
+    for _ in range(phases):
+        start = time()
+        signal = step(signal)
+        timings.append(time() - start)
+    return signal, timings
 
-    # Check if offset is in second half (this is the key optimization)
-    if message_offset < total_length // 2:
-        print("Warning: Offset is in first half - this will be slow!")
-        # For first half, we'd need the full FFT algorithm
-        # This is computationally expensive for 10000 repetitions
 
-    # We only need to compute from the offset onwards
-    # This is a huge optimization - we don't need the first half of the signal
-    signal = full_signal[message_offset:]
+def solve_part2(data):
+    # Get the message offset from first 7 digits
+    message_offset = int(data[:7])
 
-    # Run 100 phases
-    start = time()
-    for phase in range(100):
-        if phase % 10 == 0:
-            elapsed = time() - start
-            print(f"Phase {phase}/100 - Elapsed: {elapsed:.2f}s")
+    digits = np.frombuffer(data.encode(), dtype=np.uint8) - ord("0")
+    total_length = len(digits) * REPEATS
 
-        # For the second half, each position is the sum of all positions
-        # from that point to the end, mod 10
-        # We can compute this efficiently from right to left
-        new_signal = [0] * len(signal)
-        cumsum = 0
+    # We only need to compute from the offset onwards; nothing before it
+    # ever feeds into a later digit
+    reps = -(-(total_length - message_offset) // len(digits))
+    tail = np.tile(digits.astype(np.int8), reps)
+    signal = tail[len(tail) - (total_length - message_offset):]
 
-        for i in range(len(signal) - 1, -1, -1):
-            cumsum += signal[i]
-            new_signal[i] = cumsum % 10
+    if message_offset >= total_length // 2:
+        engine = "suffix"
+        step = suffix_phase
+    else:
+        engine = "pattern"
+        step = lambda s: pattern_phase(s, message_offset)
 
-        signal = new_signal
+    print(f"Message offset: {message_offset} of {total_length} ({engine} engine)")
 
-    elapsed = time() - start
-    print(f"Total time: {elapsed:.2f}s")
+    signal, timings = run_phases(signal, step)
+    print(
+        f"{len(timings)} phases in {sum(timings):.2f}s "
+        f"(min {min(timings) * 1000:.1f}ms, "
+        f"mean {sum(timings) / len(timings) * 1000:.1f}ms, "
+        f"max {max(timings) * 1000:.1f}ms)"
+    )
 
     # Extract the 8-digit message
-    message = "".join(map(str, signal[:8]))
-    return message
+    return "".join(map(str, signal[:8]))
 
 
-# Read input
-with open("input.txt", "r") as file:
-    txt = file.read().strip()
+if __name__ == "__main__":
+    with open("input.txt", "r") as file:
+        txt = file.read().strip()
 
-print("Solving Part 2...")
-result = solve_part2(txt)
-print(f"\nPart 2: {result}")
+    print("Solving Part 2...")
+    result = solve_part2(txt)
+    print(f"\nPart 2: {result}")
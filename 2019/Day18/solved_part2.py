@@ -1,33 +1,20 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-from collections import defaultdict
-
-def createLevelFrom(data):
-  x, y = 0, 0
-  level = dict()
-  for line in data:
-    for c in line:
-      if c == "@": position = (x,y)
-      level[(x,y)] = '.' if c == "@" else c
-      x += 1
-    x = 0
-    y += 1
+import heapq
+from collections import deque
+
+def createLevelFrom(data, split=False):
+  level = [list(line) for line in data]
+  robots = [(x, y) for y, line in enumerate(level) for x, c in enumerate(line) if c == "@"]
 
   # Adjust for part 2:
-  level[position] = "#"
-  level[(position[0] - 1, position[1] + 0)] = "#"
-  level[(position[0] + 1, position[1] + 0)] = "#"
-  level[(position[0] + 0, position[1] + 1)] = "#"
-  level[(position[0] + 0, position[1] - 1)] = "#"
-
-  positions = (
-    (position[0] - 1, position[1] - 1),
-    (position[0] - 1, position[1] + 1),
-    (position[0] + 1, position[1] - 1),
-    (position[0] + 1, position[1] + 1),
-  )
-  
-  return level, positions
+  if split and len(robots) == 1:
+    x, y = robots[0]
+    for dx, dy in ((0, 0), (-1, 0), (1, 0), (0, 1), (0, -1)):
+      level[y + dy][x + dx] = "#"
+    robots = [(x - 1, y - 1), (x - 1, y + 1), (x + 1, y - 1), (x + 1, y + 1)]
+    for rx, ry in robots:
+      level[ry][rx] = "@"
+
+  return level, robots
 
 def neighbors(level, p):
   return [x for x in [
@@ -35,128 +22,105 @@ def neighbors(level, p):
     (p[0] - 1, p[1]),
     (p[0], p[1] + 1),
     (p[0], p[1] - 1),
-  ] if x in level and level[x] != "#"]
-
-def draw(g, spaces, doors, keys, positions):
-  pos = nx.get_node_attributes(g, 'pos')
-  
-  nx.draw_networkx_nodes(g, pos, node_size=200, nodelist=positions, node_color='#eeee00', alpha=0.9)
-  nx.draw_networkx_nodes(g, pos, node_size=30, nodelist=spaces, node_color='#00aaee', alpha=0.8)
-  nx.draw_networkx_nodes(g, pos, node_size=150, nodelist=doors.values(), node_color='#ee0033', alpha=0.8)
-  nx.draw_networkx_nodes(g, pos, node_size=150, nodelist=keys.values(), node_color='#33ee66', alpha=0.8)
-  
-  nx.draw_networkx_edges(g, pos, alpha=0.6)
-
-  labels = nx.get_node_attributes(g,'label')
-  nx.draw_networkx_labels(g, pos, labels=labels, font_size=11, alpha=0.4)
-  
-  labels = nx.get_edge_attributes(g,'weight')
-  nx.draw_networkx_edge_labels(g, pos, font_size=7, edge_labels=labels)
-
-  plt.show()
-
-def createGameFrom(level, positions) -> (nx.Graph, set(), dict(), dict()):
-  spaces = set()
-  keys = dict()
-  doors = dict()
-  
-  curgraph = nx.Graph()
-
-  for p in level:
-    if level[p] == "#": continue
-    if level[p] == ".": spaces.add(p)
-    if level[p].isupper(): doors[level[p].lower()] = p
-    if level[p].islower(): keys[level[p]] = p
-    label = "" if level[p] == "." else level[p]
-    curgraph.add_node(p, pos=(p[0], -p[1]), label=label)
-  
-  for p in level:
-    for n in neighbors(level, p):
-      if n in curgraph.nodes() and p in curgraph.nodes():
-        curgraph.add_edge(p, n, weight=1)
-
-  # Remove leaves, both spaces and dead-end doors:
-  keepgoing = True
-  while keepgoing:
-    keepgoing = False
-    leaves = [
-      x for x in curgraph.nodes()
-      if x not in positions and len(list(curgraph.neighbors(x))) == 1
-    ]
-    for leaf in leaves:
-      if level[leaf] == "." or level[leaf].isupper():
-        keepgoing = True
-        curgraph.remove_node(leaf)
-        if level[leaf] == ".": spaces.remove(leaf) 
-        else: del doors[level[leaf].lower()]
-
-  # Another round of condensing hallways:
-  keepgoing = True
-  while keepgoing:
-    keepgoing = False
-    potentials = [x for x in curgraph.nodes() if len(list(curgraph.neighbors(x))) == 2]
-    for pot in potentials:
-      others = list(curgraph.neighbors(pot))
-      if pot in spaces and len(others) == 2 and pot not in positions:
-        weight = curgraph.edges[others[0], pot]['weight'] + curgraph.edges[others[1], pot]['weight']
-        curgraph.remove_node(pot)
-        spaces.remove(pot)
-        curgraph.add_edge(others[0], others[1], weight=weight)
-
-  return curgraph, spaces, doors, keys
-
-def solve(data):
-  level, positions = createLevelFrom(data)
-  curgraph, spaces, doors, keys = createGameFrom(level, positions)
-  # draw(curgraph, spaces, doors, keys, positions)
-
-  allkeys = frozenset(keys.keys())
-  alldoors = frozenset(doors.keys())
-  states = { (positions, frozenset()): 0 }
-
-  midx = min([x for x,_ in positions]) + 1
-  midy = min([y for _,y in positions]) + 1
-  
-  while True:
-    newstates = dict()
-
-    print(f"Recursing. First state with nr of keys: {len(next(iter(states))[1])}")
-
-    for state in states:
-      neededKeys = allkeys - state[1]
-      closeddoors = alldoors - set([x for x in state[1]])
-      closeddoorspoints = set([doors[k] for k in closeddoors])
-
-      for target in [keys[k] for k in keys if k in neededKeys]:
-        if target[0] < midx and target[1] < midy: boti = 0
-        elif target[0] < midx and target[1] > midy: boti = 1
-        elif target[0] > midx and target[1] < midy: boti = 2
-        elif target[0] > midx and target[1] > midy: boti = 3
-
-        weight, path = nx.single_source_dijkstra(curgraph, state[0][boti], target, weight="weight")
-
-        if set(path) & closeddoorspoints: continue
-
-        newcost = states[state] + weight
-        if boti == 0: newpos = (path[-1], state[0][1], state[0][2], state[0][3])
-        elif boti == 1: newpos = (state[0][0], path[-1], state[0][2], state[0][3])
-        elif boti == 2: newpos = (state[0][0], state[0][1], path[-1], state[0][3])
-        elif boti == 3: newpos = (state[0][0], state[0][1], state[0][2], path[-1])
-        newkeys = frozenset(state[1] | { level[path[-1]] })
-        newstate = (newpos, newkeys)
-        newstates[newstate] = min(newcost, newstates[newstate]) if newstate in newstates else newcost
-
-    states = newstates
-
-    done = False
-    for state in [s for s in states if s[1] == allkeys]:
-      done = True
-    if done: break
-
-  return min(states.values())
-
-def solveFromFile(file):
+  ] if 0 <= x[1] < len(level) and 0 <= x[0] < len(level[x[1]]) and level[x[1]][x[0]] != "#"]
+
+def keyBit(c):
+  return 1 << (ord(c.lower()) - ord("a"))
+
+class Vault:
+  """Pairwise routes between robots and keys.
+
+  Nodes 0..R-1 are the robots' start cells and R.. are the keys.
+  routes[node] lists (key node, distance, doors mask, keys mask) for
+  every key reachable from node, where the masks hold the doors that must
+  be open on the way and the other keys picked up in passing.
+  """
+
+  def __init__(self, level, robots):
+    self.level = level
+    keys = sorted(
+      (c, (x, y)) for y, line in enumerate(level) for x, c in enumerate(line) if c.islower()
+    )
+    self.robots = len(robots)
+    self.cells = list(robots) + [p for _, p in keys]
+    self.keyBits = [0] * self.robots + [keyBit(c) for c, _ in keys]
+    self.allKeys = 0
+    for bit in self.keyBits:
+      self.allKeys |= bit
+    index = {p: node for node, p in enumerate(self.cells)}
+    self.routes = [self.routesFrom(p, index) for p in self.cells]
+
+  def routesFrom(self, start, index):
+    level = self.level
+    seen = {start}
+    queue = deque([(start, 0, 0, 0)])
+    routes = []
+    while queue:
+      p, dist, doors, passed = queue.popleft()
+      c = level[p[1]][p[0]]
+      if c.isupper():
+        doors |= keyBit(c)
+      if c.islower() and p != start:
+        routes.append((index[p], dist, doors, passed))
+        passed |= keyBit(c)
+      for n in neighbors(level, p):
+        if n not in seen:
+          seen.add(n)
+          queue.append((n, dist + 1, doors, passed))
+    return routes
+
+  def collect(self):
+    """Dijkstra over (robot nodes, collected keys) packed into one int.
+
+    Returns (steps, states expanded, peak heap size).
+    """
+    robots = self.robots
+    bits = len(self.cells).bit_length()
+    mask = (1 << bits) - 1
+    shift = bits * robots
+
+    start = 0
+    for r in range(robots):
+      start |= r << (bits * r)
+
+    best = {start: 0}
+    queue = [(0, start)]
+    expanded = 0
+    peak = 1
+
+    while queue:
+      steps, state = heapq.heappop(queue)
+      if steps > best[state]:
+        continue
+      have = state >> shift
+      if have == self.allKeys:
+        return steps, expanded, peak
+      expanded += 1
+
+      for r in range(robots):
+        node = (state >> (bits * r)) & mask
+        for target, dist, doors, passed in self.routes[node]:
+          bit = self.keyBits[target]
+          if have & bit or doors & ~have:
+            continue
+          nextHave = have | bit | passed
+          nextState = (nextHave << shift) | (state & ((1 << shift) - 1) & ~(mask << (bits * r))) | (target << (bits * r))
+          nextSteps = steps + dist
+          if nextSteps < best.get(nextState, nextSteps + 1):
+            best[nextState] = nextSteps
+            heapq.heappush(queue, (nextSteps, nextState))
+      peak = max(peak, len(queue))
+
+    return None, expanded, peak
+
+def solve(data, split=False):
+  level, robots = createLevelFrom(data, split)
+  return Vault(level, robots).collect()
+
+def solveFromFile(file, split=False):
   with open(file, 'r') as file:
-    return solve(file.read().splitlines())
+    return solve(file.read().splitlines(), split)
 
-print("Part 2:", solveFromFile("input.txt"))
+for part, split in ((1, False), (2, True)):
+  steps, expanded, peak = solveFromFile("input.txt", split)
+  print(f"Part {part}:", steps, f"({expanded} states expanded, peak heap {peak})")
@@ -1,55 +1,50 @@
-def draw(level):
-  size = 5 # assume a square
-  for y in range(size):
-    line = "".join([level[(x,y)] for x in range(size)])
-    print(line)
-
-def stringify(level):
-  return "".join(level.values())
-
-def neighbors(level, p):
-  return [p for p in [
-    (p[0] - 1, p[1]),
-    (p[0] + 1, p[1]),
-    (p[0], p[1] - 1),
-    (p[0], p[1] + 1),
-  ] if p in level]
+SIZE = 5 # assume a square
+CELLS = SIZE * SIZE
+
+def neighbourMask(i):
+  x, y = i % SIZE, i // SIZE
+  mask = 0
+  if x > 0: mask |= 1 << (i - 1)
+  if x < SIZE - 1: mask |= 1 << (i + 1)
+  if y > 0: mask |= 1 << (i - SIZE)
+  if y < SIZE - 1: mask |= 1 << (i + SIZE)
+  return mask
+
+# Bit i is the tile at (i % 5, i // 5), so a board is its own biodiversity
+NEIGHBOURS = [neighbourMask(i) for i in range(CELLS)]
+
+def draw(board):
+  for y in range(SIZE):
+    print("".join("#" if board >> (y * SIZE + x) & 1 else "." for x in range(SIZE)))
+
+def parseBoard(raw):
+  board = 0
+  for y, line in enumerate(raw[:SIZE]):
+    for x, c in enumerate(line[:SIZE]):
+      if c == "#": board |= 1 << (y * SIZE + x)
+  return board
+
+def step(board):
+  newboard = 0
+  for i, mask in enumerate(NEIGHBOURS):
+    bugcount = (board & mask).bit_count()
+    if board >> i & 1:
+      if bugcount == 1: newboard |= 1 << i
+    elif bugcount == 1 or bugcount == 2:
+      newboard |= 1 << i
+  return newboard
 
 def solve(raw):
-  level = dict()
-
-  x,y = 0,0
-  for line in raw:
-    for c in line:
-      level[(x,y)] = c
-      x += 1
-    y += 1
-    x = 0
-  
+  board = parseBoard(raw)
   layouts = set()
 
-  while True:
-    txt = stringify(level)
-    if txt in layouts: break
-    layouts.add(txt)
-    newlevel = dict()
-    for p in level:
-      ns = neighbors(level, p)
-      bugcount = sum([1 for n in ns if level[n] == "#"])
-      if level[p] == "#" and not bugcount == 1: newlevel[p] = "."
-      elif level[p] == "." and (bugcount == 1 or bugcount == 2): newlevel[p] = "#"
-      else: newlevel[p] = level[p]
-    level = newlevel
-
-  power = 1
-  result = 0
-  for p in level:
-    if level[p] == "#": result += power
-    power = power * 2
-
-  return result
+  while board not in layouts:
+    layouts.add(board)
+    board = step(board)
+
+  return board
 
 with open('input.txt', 'r') as file:
   raw = file.read().splitlines()
 
-print("Solution:", solve(raw))
\ No newline at end of file
+print("Solution:", solve(raw))
@@ -1,90 +1,156 @@
-def drawsingle(level):
-  size = 5 # assume a square
-  for y in range(size):
-    line = "".join([level[(x,y)] for x in range(size)])
-    print(line)
-
-def draw(levels):
-  mini = min(levels.keys())
-  maxi = max(levels.keys())
-
-  for i in range(mini, maxi + 1):
-    print("\nLevel", i)
-    drawsingle(levels[i])
-
-def neighbors(levels, rec, p):
-  ns = []
-
-  if (p[0] - 1, p[1]) != (2,2) and (p[0] - 1, p[1]) in levels[rec]: ns.append(levels[rec][(p[0] - 1, p[1])])
-  if (p[0] + 1, p[1]) != (2,2) and (p[0] + 1, p[1]) in levels[rec]: ns.append(levels[rec][(p[0] + 1, p[1])])
-  if (p[0], p[1] - 1) != (2,2) and (p[0], p[1] - 1) in levels[rec]: ns.append(levels[rec][(p[0], p[1] - 1)])
-  if (p[0], p[1] + 1) != (2,2) and (p[0], p[1] + 1) in levels[rec]: ns.append(levels[rec][(p[0], p[1] + 1)])
-
-  if rec + 1 in levels:
-    if p[1] == 0: ns.append(levels[rec + 1][(2,1)]) # add 8 to A-E
-    if p[1] == 4: ns.append(levels[rec + 1][(2,3)]) # add 18 to U-Y
-    if p[0] == 0: ns.append(levels[rec + 1][(1,2)]) # add 12 to A/F/K/P/U
-    if p[0] == 4: ns.append(levels[rec + 1][(3,2)]) # add 14 to E/J/O/T/Y
-
-  if rec - 1 in levels:
-    if p == (2,1): ns.extend([levels[rec - 1][p] for p in levels[rec - 1] if p[1] == 0]) # add toprow to H
-    if p == (1,2): ns.extend([levels[rec - 1][p] for p in levels[rec - 1] if p[0] == 0]) # add leftrow to L
-    if p == (3,2): ns.extend([levels[rec - 1][p] for p in levels[rec - 1] if p[0] == 4]) # add right to N
-    if p == (2,3): ns.extend([levels[rec - 1][p] for p in levels[rec - 1] if p[1] == 4]) # add botrow to R
-
-  return ns
-
-def createlevel(data):
-  level = dict()
-
-  x,y = 0,0
-  for line in data:
-    for c in line:
-      level[(x,y)] = c
-      x += 1
-    y += 1
-    x = 0
-
-  level[(2,2,)] = "?" # just to be sure
-
-  return level
-
-def solve(raw):
-  levels = dict()
-  levels[0] = createlevel(raw)
-  empty = createlevel([".....", ".....", "..?..", ".....", "....."])
-  
-  for minutes in range(200):
-    print(f"At minute {minutes}")
-    
-    newlevels = dict()
-
-    for depth in range(-minutes-1, minutes+2):
-      if depth not in levels:
-        levels[depth] = empty.copy()
-
-      level = levels[depth]
-      newlevel = dict()
-      newlevels[depth] = newlevel
-
-      for p in level:
-        ns = neighbors(levels, depth, p)
-        bugcount = sum([1 for n in ns if n == "#"])
-        if level[p] == "#" and not bugcount == 1: newlevel[p] = "."
-        elif level[p] == "." and (bugcount == 1 or bugcount == 2): newlevel[p] = "#"
-        else: newlevel[p] = level[p]
-
-    levels = newlevels
-
-  # draw(levels)
-
-  result = 0
-  for rec in range(min(levels.keys()), max(levels.keys())):
-    result += sum([1 for p in levels[rec] if levels[rec][p] == "#"])
-
-  return result
-
-with open('input.txt', 'r') as file:
-  raw = file.read().splitlines()
-
-print("Solution:", solve(raw))
\ No newline at end of file
+import numpy as np
+
+SIZE = 5 # assume a square
+CELLS = SIZE * SIZE
+FULL = (1 << CELLS) - 1
+
+def cellMask(cells):
+  mask = 0
+  for x, y in cells:
+    mask |= 1 << (y * SIZE + x)
+  return mask
+
+TOP = cellMask((x, 0) for x in range(SIZE))
+BOTTOM = cellMask((x, SIZE - 1) for x in range(SIZE))
+LEFT = cellMask((0, y) for y in range(SIZE))
+RIGHT = cellMask((SIZE - 1, y) for y in range(SIZE))
+CENTER = cellMask([(2, 2)])
+
+# The tiles around the centre, each touching one edge of the inner level
+ABOVE, BELOW, BESIDE_LEFT, BESIDE_RIGHT = 7, 17, 11, 13
+
+def parseBoard(raw):
+  board = 0
+  for y, line in enumerate(raw[:SIZE]):
+    for x, c in enumerate(line[:SIZE]):
+      if c == "#": board |= 1 << (y * SIZE + x)
+  return board & ~CENTER
+
+def drawsingle(board):
+  for y in range(SIZE):
+    print("".join("?" if (x, y) == (2, 2) else "#" if board >> (y * SIZE + x) & 1 else "." for x in range(SIZE)))
+
+# Tiles of the inner level that each tile around the centre touches, in
+# the order they are folded into the neighbour terms below
+INNER_EDGES = [
+  (BESIDE_RIGHT, [y * SIZE + SIZE - 1 for y in range(SIZE)]),
+  (BESIDE_LEFT, [y * SIZE for y in range(SIZE)]),
+  (BELOW, [CELLS - SIZE + x for x in range(SIZE)]),
+  (ABOVE, [x for x in range(SIZE)]),
+]
+
+def shifted(bits, offset):
+  return bits << np.uint32(offset) if offset >= 0 else bits >> np.uint32(-offset)
+
+# For each position i along the inner edges, how to move that tile of every
+# edge onto the tile around the centre it touches: (offset, target bit)
+INNER_MOVES = [
+  [(cell - sources[i], np.uint32(1 << cell)) for cell, sources in INNER_EDGES]
+  for i in range(SIZE)
+]
+
+# The outer level's tile next to the centre reaches a whole edge
+OUTER_MOVES = [
+  (np.uint32(cell), np.uint32(edge))
+  for cell, edge in [(BESIDE_LEFT, LEFT), (BESIDE_RIGHT, RIGHT), (ABOVE, TOP), (BELOW, BOTTOM)]
+]
+
+ONE = np.uint32(1)
+ROW = np.uint32(SIZE)
+NOT_LEFT = np.uint32(FULL & ~LEFT)
+NOT_RIGHT = np.uint32(FULL & ~RIGHT)
+NOT_TOP = np.uint32(FULL & ~TOP)
+NOT_BOTTOM = np.uint32(FULL & ~BOTTOM)
+GRID = np.uint32(FULL & ~CENTER)
+
+class Eris:
+  """Every recursion level as a 25-bit board in one uint32 array.
+
+  Level k + 1 sits inside the centre tile of level k, so the outer and
+  inner neighbours of every level are the same array shifted by one.
+  Shifting the boards by one or five bits lines up a level's own left,
+  right, upper and lower tiles, so one minute is a few dozen array
+  operations over all levels at once. Only occupied levels are kept, plus
+  an empty one on each side for the bugs to spread into; depth is the
+  recursion depth of the first level.
+  """
+
+  def __init__(self, board):
+    self.levels = np.array([0, board, 0], dtype=np.uint32)
+    self.depth = -1
+
+  def bugs(self):
+    return int(np.bitwise_count(self.levels).sum())
+
+  def level(self, depth):
+    index = depth - self.depth
+    return int(self.levels[index]) if 0 <= index < len(self.levels) else 0
+
+  def step(self):
+    levels = self.levels
+    padded = np.zeros(len(levels) + 2, dtype=np.uint32)
+    padded[1:-1] = levels
+    outer = padded[:-2]
+    inner = padded[2:]
+
+    def fromInner(i):
+      return [shifted(inner, offset) & target for offset, target in INNER_MOVES[i]]
+
+    # A tile's neighbour in each direction is its own level's tile, the
+    # outer level's tile next to the centre when it sits on that edge, or
+    # for the tiles around the centre, one tile of the inner level's edge.
+    # Those cases never overlap, so each direction is a single term.
+    fromOuter = [((outer >> cell) & ONE) * edge for cell, edge in OUTER_MOVES]
+    left, right, up, down = fromInner(0)
+    terms = [
+      (levels << ONE) & NOT_LEFT | fromOuter[0] | left,
+      (levels >> ONE) & NOT_RIGHT | fromOuter[1] | right,
+      (levels << ROW) & NOT_TOP | fromOuter[2] | up,
+      (levels >> ROW) & NOT_BOTTOM | fromOuter[3] | down,
+    ]
+
+    # The remaining tiles of each inner edge
+    for i in range(1, SIZE):
+      a, b, c, d = fromInner(i)
+      terms.append(a | b | c | d)
+
+    # Bit-sliced saturating counters: exactly one and exactly two
+    ones = terms[0]
+    twos = np.zeros_like(ones)
+    seen = ones
+    for term in terms[1:]:
+      missed = ~term
+      twos = (twos & missed) | (ones & term)
+      ones = (ones & missed) | (term & ~seen)
+      seen = seen | term
+
+    levels = ((levels & ones) | (~levels & (ones | twos))) & GRID
+
+    # Keep exactly one empty level on each side of the bugs
+    occupied = np.flatnonzero(levels)
+    if occupied.size:
+      first, last = occupied[0], occupied[-1]
+      self.depth += int(first) - 1
+      levels = np.concatenate(([0], levels[first:last + 1], [0])).astype(np.uint32)
+    self.levels = levels
+
+def draw(eris):
+  for depth in range(eris.depth, eris.depth + len(eris.levels)):
+    board = eris.level(depth)
+    if board:
+      print("\nDepth", depth)
+      drawsingle(board)
+
+def solve(raw, minutes = 200):
+  eris = Eris(parseBoard(raw))
+  for _ in range(minutes):
+    eris.step()
+
+  # draw(eris)
+  return eris.bugs()
+
+if __name__ == '__main__':
+  with open('input.txt', 'r') as file:
+    raw = file.read().splitlines()
+
+  print("Solution:", solve(raw))